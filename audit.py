@@ -5,8 +5,15 @@ Audit logging for Domeneshop CLI/GUI
 Logger sikkerhetshendelser til fil for overvåking og feilsøking.
 """
 
+import atexit
 import logging
+import os
+import time
+from collections import OrderedDict, deque
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -16,6 +23,10 @@ from functools import wraps
 AUDIT_LOG_FILE = Path.home() / ".domeneshop-audit.log"
 LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+FLUSH_INTERVAL = 1.0   # sekunder mellom periodiske flushes
+WRITE_BUFFER_SIZE = 8192
+MAX_LOG_BYTES = 10 * 1024 * 1024   # rullér loggen ved 10 MB
+LOG_BACKUP_COUNT = 5
 
 # Hendelsestyper
 class AuditEvent:
@@ -43,39 +54,271 @@ class AuditEvent:
     INVALID_INPUT = "INVALID_INPUT"
 
 
+# Hendelse -> loggnivå (bygges én gang ved import; oppslag er O(1))
+_LEVEL_BY_EVENT = {evt: logging.WARNING for evt in (
+    AuditEvent.AUTH_FAILURE,
+    AuditEvent.RATE_LIMIT_HIT,
+    AuditEvent.CSRF_FAILURE,
+    AuditEvent.INVALID_INPUT,
+)}
+
+
+# Demping av hendelsesflommer: identiske hendelser innenfor vinduet
+# undertrykkes, og total hendelsesrate per prosess er begrenset med en
+# enkel token-bucket. Hindrer at én støyende IP dominerer diskkostnaden.
+DEDUP_WINDOW = 5.0          # sekunder før samme hendelse logges igjen
+DEDUP_MAX_KEYS = 1024       # maks antall nøkler i dedup-tabellen
+MAX_EVENTS_PER_SECOND = 1000
+
+_last_seen: "OrderedDict[tuple, float]" = OrderedDict()
+_tokens = float(MAX_EVENTS_PER_SECOND)
+_tokens_refilled = 0.0
+_suppress_lock = threading.Lock()
+
+
+def _should_suppress(event_type: str, ip_address: Optional[str], message: str,
+                     domain_id: Optional[int] = None, record_id: Optional[int] = None,
+                     extra: Optional[dict] = None) -> bool:
+    """Avgjør om en hendelse skal droppes (duplikat eller over rate-taket)"""
+    global _tokens, _tokens_refilled
+    now = time.monotonic()
+
+    with _suppress_lock:
+        # Etterfyll token-bucket
+        elapsed = now - _tokens_refilled
+        if elapsed > 0:
+            _tokens = min(float(MAX_EVENTS_PER_SECOND),
+                          _tokens + elapsed * MAX_EVENTS_PER_SECOND)
+            _tokens_refilled = now
+        if _tokens < 1.0:
+            return True
+
+        # Undertrykk identiske hendelser innenfor vinduet. Identiteten må
+        # omfatte domene/post/ekstra-feltene: DNS-/forward-hendelser bærer
+        # hva de gjelder der, ikke i message, og to ulike mutasjoner skal
+        # aldri kollapse til én audit-linje
+        key = (event_type, ip_address, message, domain_id, record_id,
+               tuple(sorted(extra.items())) if extra else None)
+        last = _last_seen.get(key)
+        if last is not None and now - last < DEDUP_WINDOW:
+            _last_seen.move_to_end(key)
+            return True
+
+        _last_seen[key] = now
+        _last_seen.move_to_end(key)
+        while len(_last_seen) > DEDUP_MAX_KEYS:
+            _last_seen.popitem(last=False)
+
+        _tokens -= 1.0
+        return False
+
+
 # Opprett logger
 _audit_logger: Optional[logging.Logger] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_dropped_events = 0
+_dropped_unreported = 0
+
+
+class _DropOldQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler som forkaster eldste hendelse fremfor å blokkere når køen er full
+
+    Den nyeste hendelsen er mest verdt i en audit-logg; ved full kø vrakes
+    derfor den eldste posten, og en oppsummeringslinje skrives til loggen
+    så tapene ikke er usynlige.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped_events, _dropped_unreported
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            _dropped_events += 1
+            _dropped_unreported += 1
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                return
+        if _dropped_unreported:
+            n, _dropped_unreported = _dropped_unreported, 0
+            summary = logging.LogRecord(
+                record.name, logging.WARNING, __file__, 0,
+                f"AUDIT_DROPPED | {n} hendelse(r) forkastet pga. full loggkø "
+                f"({_dropped_events} totalt)", None, None,
+            )
+            try:
+                self.queue.put_nowait(summary)
+            except queue.Full:
+                _dropped_unreported = n
+
+
+class _AuditFormatter(logging.Formatter):
+    """Setter sammen audit-feltene til én linje først når posten skrives.
+
+    log_event sender feltene som `extra` på posten, slik at join- og
+    f-string-arbeidet skjer på listener-tråden og ikke i kallerens
+    request-sti.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        d = record.__dict__
+        parts = [record.getMessage()]
+
+        message = d.get("audit_message")
+        if message:
+            parts.append(message)
+
+        ip_address = d.get("ip_address")
+        if ip_address:
+            parts.append(f"IP: {ip_address}")
+
+        user_agent = d.get("user_agent")
+        if user_agent:
+            # Kutt User-Agent til rimelig lengde
+            ua_short = user_agent[:100] + "..." if len(user_agent) > 100 else user_agent
+            parts.append(f"UA: {ua_short}")
+
+        domain_id = d.get("domain_id")
+        if domain_id is not None:
+            parts.append(f"Domain: {domain_id}")
+
+        record_id = d.get("record_id")
+        if record_id is not None:
+            parts.append(f"Record: {record_id}")
+
+        extra_fields = d.get("extra_fields")
+        if extra_fields:
+            for key, value in extra_fields.items():
+                parts.append(f"{key}: {value}")
+
+        record.msg = " | ".join(parts)
+        record.args = None
+        return super().format(record)
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler med blokk-bufret skriving og periodisk flush.
+
+    Standard FileHandler flusher per post; her samles mange små poster i
+    én buffer (8 KB) som skrives med ett syscall, mens en daemon-tråd
+    flusher hvert sekund så hendelser ikke blir liggende i minnet.
+    Loggen rulleres ved MAX_LOG_BYTES slik at diskbruken er begrenset -
+    rulleringen skjer på listener-tråden og stopper aldri request-stien.
+    Filstørrelsen telles lokalt så rulleringssjekken ikke trenger
+    seek/tell (som ville flushet bufferen per post).
+    """
+
+    def __init__(self, filename: Path, encoding: str = "utf-8"):
+        super().__init__(
+            filename, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUP_COUNT,
+            encoding=encoding, delay=True
+        )
+        self._size = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._audit_closed = False
+        self._schedule_flush()
+        atexit.register(self.close)
+
+    def _open(self):
+        try:
+            self._size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._size = 0
+        return open(self.baseFilename, self.mode, encoding=self.encoding,
+                    buffering=WRITE_BUFFER_SIZE)
+
+    def _schedule_flush(self) -> None:
+        if self._audit_closed:
+            return
+        self._flush_timer = threading.Timer(FLUSH_INTERVAL, self._periodic_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _periodic_flush(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            pass
+        self._schedule_flush()
+
+    def close(self) -> None:
+        self._audit_closed = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        super().close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            # Tell bytes, ikke tegn: maxBytes og getsize i _open er bytes,
+            # og norske meldinger er flerbyte i UTF-8
+            msg_bytes = len(msg.encode("utf-8"))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size + msg_bytes >= self.maxBytes:
+                self.doRollover()
+                self.stream = self._open()
+            self.stream.write(msg)
+            self._size += msg_bytes
+        except Exception:
+            self.handleError(record)
 
 
 def _get_logger() -> logging.Logger:
-    """Hent eller opprett audit logger"""
-    global _audit_logger
-    
+    """Hent eller opprett audit logger.
+
+    Fil-I/O skjer på en egen bakgrunnstråd via QueueListener, slik at
+    log_event() bare legger posten i kø og aldri blokkerer på disk.
+    """
+    global _audit_logger, _queue_listener
+
     if _audit_logger is not None:
         return _audit_logger
-    
+
     _audit_logger = logging.getLogger("domeneshop.audit")
     _audit_logger.setLevel(logging.INFO)
-    
+
     # Unngå duplikate handlers
     if not _audit_logger.handlers:
         try:
+            # Sørg for at filen finnes med rettigheter kun for eier før
+            # første post skrives, men unngå chmod-syscall når
+            # rettighetene allerede er riktige
+            if sys.platform != "win32":
+                try:
+                    mode = AUDIT_LOG_FILE.stat().st_mode & 0o777
+                except FileNotFoundError:
+                    AUDIT_LOG_FILE.touch(mode=0o600)
+                    mode = 0o600
+                if mode != 0o600:
+                    AUDIT_LOG_FILE.chmod(0o600)
+
             # Fil-handler
-            file_handler = logging.FileHandler(AUDIT_LOG_FILE, encoding="utf-8")
+            file_handler = _BufferedRotatingFileHandler(AUDIT_LOG_FILE, encoding="utf-8")
             file_handler.setLevel(logging.INFO)
-            file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
-            _audit_logger.addHandler(file_handler)
-            
-            # Sett filrettigheter til kun eier
-            if sys.platform != "win32":
-                AUDIT_LOG_FILE.chmod(0o600)
+            file_handler.setFormatter(_AuditFormatter(LOG_FORMAT, DATE_FORMAT))
+
+            # Kø mellom kallere og fil-handleren - skriving skjer på
+            # listener-tråden, ikke i request-/kommandostien
+            log_queue: queue.Queue = queue.Queue(maxsize=10000)
+            _audit_logger.addHandler(_DropOldQueueHandler(log_queue))
+
+            _queue_listener = logging.handlers.QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            _queue_listener.start()
+            atexit.register(_queue_listener.stop)
         except Exception as e:
             # Fallback til stderr hvis fil ikke kan opprettes
             stderr_handler = logging.StreamHandler(sys.stderr)
-            stderr_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+            stderr_handler.setFormatter(_AuditFormatter(LOG_FORMAT, DATE_FORMAT))
             _audit_logger.addHandler(stderr_handler)
             _audit_logger.warning(f"Kunne ikke opprette audit-loggfil: {e}")
-    
+
     return _audit_logger
 
 
@@ -101,39 +344,25 @@ def log_event(
         extra: Ekstra metadata
     """
     logger = _get_logger()
-    
-    # Bygg loggmelding
-    parts = [event_type]
-    
-    if message:
-        parts.append(message)
-    
-    if ip_address:
-        parts.append(f"IP: {ip_address}")
-    
-    if user_agent:
-        # Kutt User-Agent til rimelig lengde
-        ua_short = user_agent[:100] + "..." if len(user_agent) > 100 else user_agent
-        parts.append(f"UA: {ua_short}")
-    
-    if domain_id is not None:
-        parts.append(f"Domain: {domain_id}")
-    
-    if record_id is not None:
-        parts.append(f"Record: {record_id}")
-    
-    if extra:
-        for key, value in extra.items():
-            parts.append(f"{key}: {value}")
-    
-    log_message = " | ".join(parts)
-    
-    # Velg loggnivå basert på hendelsestype
-    if event_type in (AuditEvent.AUTH_FAILURE, AuditEvent.RATE_LIMIT_HIT, 
-                      AuditEvent.CSRF_FAILURE, AuditEvent.INVALID_INPUT):
-        logger.warning(log_message)
-    else:
-        logger.info(log_message)
+
+    # Avgjør loggnivå og avbryt før noe strengarbeid hvis posten
+    # uansett ville blitt filtrert bort
+    level = _LEVEL_BY_EVENT.get(event_type, logging.INFO)
+    if not logger.isEnabledFor(level):
+        return
+
+    if _should_suppress(event_type, ip_address, message, domain_id, record_id, extra):
+        return
+
+    # Send feltene rå - _AuditFormatter bygger linjen på listener-tråden
+    logger.log(level, event_type, extra={
+        "audit_message": message,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "domain_id": domain_id,
+        "record_id": record_id,
+        "extra_fields": extra,
+    })
 
 
 # ==================== CONVENIENCE FUNCTIONS ====================
@@ -230,31 +459,46 @@ def log_account_selected(account_name: str, ip_address: Optional[str] = None) ->
 
 # ==================== FLASK HELPERS ====================
 
+def _flask_request():
+    """Hent Flasks request-proxy uten å utløse import av flask
+
+    GUI-en har alltid importert flask før audit-helperne kalles, så et
+    oppslag i sys.modules holder. CLI-stien slipper dermed flask-importen
+    (~80 ms) ved oppstart.
+    """
+    mod = sys.modules.get("flask")
+    return mod.request if mod is not None else None
+
+
 def get_client_ip() -> Optional[str]:
     """
     Hent klient IP fra Flask request.
     Håndterer X-Forwarded-For for reverse proxies.
     """
+    request = _flask_request()
+    if request is None:
+        return None
     try:
-        from flask import request
-        
         # Sjekk X-Forwarded-For først (for proxies)
         forwarded = request.headers.get("X-Forwarded-For")
         if forwarded:
             # Første IP i listen er klienten
             return forwarded.split(",")[0].strip()
-        
+
         return request.remote_addr
-    except Exception:
+    except RuntimeError:
+        # Utenfor request-kontekst (f.eks. CLI-bruk)
         return None
 
 
 def get_user_agent() -> Optional[str]:
     """Hent User-Agent fra Flask request"""
+    request = _flask_request()
+    if request is None:
+        return None
     try:
-        from flask import request
         return request.headers.get("User-Agent")
-    except Exception:
+    except RuntimeError:
         return None
 
 
@@ -289,24 +533,55 @@ def get_audit_log_path() -> Path:
     return AUDIT_LOG_FILE
 
 
+def _tail_lines(path: Path, count: int) -> list:
+    """
+    Les de siste `count` linjene i en fil uten å lese hele filen.
+
+    Leser bakover i 8 KB-blokker fra slutten til nok linjeskift er
+    funnet, så kostnaden er O(count · linjelengde) uavhengig av
+    filstørrelse.
+    """
+    BLOCK = 8192
+    with open(path, "rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        offset = fh.tell()
+        buffer = b""
+
+        while offset > 0 and buffer.count(b"\n") <= count:
+            read_size = min(BLOCK, offset)
+            offset -= read_size
+            fh.seek(offset)
+            buffer = fh.read(read_size) + buffer
+
+    lines = buffer.splitlines()
+    return [line.decode("utf-8", errors="replace") for line in lines[-count:]]
+
+
 def get_recent_events(count: int = 50) -> list:
     """
     Les de siste N hendelsene fra audit-loggen.
-    
+
     Args:
         count: Antall hendelser å returnere
-    
+
     Returns:
         Liste med logglinjer (nyeste først)
     """
     if not AUDIT_LOG_FILE.exists():
         return []
-    
+
     try:
-        with open(AUDIT_LOG_FILE, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        
         # Returner de siste N linjene, reversert (nyeste først)
-        return [line.strip() for line in reversed(lines[-count:])]
+        return [line.strip() for line in reversed(_tail_lines(AUDIT_LOG_FILE, count))]
+    except OSError:
+        # Fallback for ikke-søkbare filer: deque(f, maxlen=N) holder bare
+        # de siste N linjene i en ringbuffer, så minnebruken er O(count)
+        # selv om hele filen må leses
+        try:
+            with open(AUDIT_LOG_FILE, "r", encoding="utf-8") as f:
+                tail = deque(f, maxlen=count)
+            return [line.strip() for line in reversed(tail)]
+        except Exception:
+            return []
     except Exception:
         return []
@@ -22,20 +22,74 @@ Multi-konto struktur (versjon 2):
 import os
 import sys
 import json
+import time
+import functools
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Any, Callable, Optional, Tuple, List, Dict
 
 # Konfigurasjon
 SERVICE_NAME = "domeneshop-cli"
 CONFIG_FILE = Path.home() / ".domeneshop-credentials"
 CREDENTIAL_VERSION = 2
 
-# Sjekk om keyring er tilgjengelig
+# Sjekk om keyring er tilgjengelig - uten å importere den. Selve importen
+# drar inn backend-kjeden (dbus/SecretService m.m., titalls ms) og utsettes
+# til første faktiske keychain-kall; --help, miljøvariabel-stien og
+# fil-lagring betaler den aldri
+import importlib.util
+
+KEYRING_AVAILABLE = importlib.util.find_spec("keyring") is not None
+
+
+class _LazyKeyring:
+    """Proxy som importerer keyring ved første attributtoppslag
+
+    Etter første oppslag rebindes modul-globalen til den ekte modulen,
+    så proxy-kostnaden er engangs.
+    """
+
+    def __getattr__(self, attr):
+        global keyring
+        import keyring as _keyring
+        keyring = _keyring
+        return getattr(_keyring, attr)
+
+
+keyring = _LazyKeyring() if KEYRING_AVAILABLE else None
+
+# orjson er valgfri - raskere JSON-parsing/-serialisering hvis installert
 try:
-    import keyring
-    KEYRING_AVAILABLE = True
+    import orjson
 except ImportError:
-    KEYRING_AVAILABLE = False
+    orjson = None
+
+
+# Kortlevd cache for oppslag som treffer keychain/fil. Keychain-kall er
+# IPC-rundturer (flere ms på macOS/libsecret), og GUI-et poller disse
+# funksjonene gjentatte ganger. Invalideres ved alle mutasjoner.
+def _env_has_creds() -> bool:
+    """Sjekk om credentials er satt via miljøvariabler"""
+    return bool(os.environ.get("DOMENESHOP_TOKEN") and os.environ.get("DOMENESHOP_SECRET"))
+
+
+_CACHE_TTL = 2.0
+_probe_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cached(key: str, producer: Callable[[], Any]) -> Any:
+    """Returner cachet verdi for `key`, eller kjør `producer` og cache"""
+    now = time.monotonic()
+    hit = _probe_cache.get(key)
+    if hit is not None and now - hit[0] < _CACHE_TTL:
+        return hit[1]
+    value = producer()
+    _probe_cache[key] = (now, value)
+    return value
+
+
+def _invalidate_cache() -> None:
+    """Tøm probe-cachen etter mutasjoner i credential-lagringen"""
+    _probe_cache.clear()
 
 
 class CredentialStorage:
@@ -54,7 +108,11 @@ class CredentialStorage:
     
     @staticmethod
     def get_storage_type() -> str:
-        """Returner hvilken lagringstype som brukes"""
+        """Returner hvilken lagringstype som brukes (cachet kort)"""
+        return _cached("storage_type", CredentialStorage._probe_storage_type)
+
+    @staticmethod
+    def _probe_storage_type() -> str:
         token = os.environ.get("DOMENESHOP_TOKEN")
         if token:
             return "environment"
@@ -77,29 +135,79 @@ class CredentialStorage:
 
 # ==================== INTERNAL HELPERS ====================
 
+@functools.lru_cache(maxsize=256)
 def _get_keychain_key(account_name: str, key_type: str) -> str:
-    """Generer keychain-nøkkel for en konto"""
+    """Generer keychain-nøkkel for en konto (ren funksjon, cachet)"""
     return f"{account_name}:{key_type}"
 
 
+# Parsert innhold av CONFIG_FILE, gyldig så lenge mtime er uendret.
+# Flere funksjoner (list_accounts, save/delete, needs_migration, ...)
+# leser filen i samme operasjon; med denne cachen koster gjentatte kall
+# én stat() i stedet for open()+json.load() hver gang.
+_file_cache = {"mtime": -1, "data": {}}
+
+
 def _read_file_data() -> dict:
-    """Les rå data fra konfigurasjonsfil"""
-    if not CONFIG_FILE.exists():
+    """Les rå data fra konfigurasjonsfil (cachet på mtime)"""
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        _file_cache["mtime"] = -1
+        _file_cache["data"] = {}
         return {}
+
+    if mtime == _file_cache["mtime"]:
+        return _file_cache["data"]
+
     try:
-        with open(CONFIG_FILE) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(CONFIG_FILE, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (ValueError, IOError):
         return {}
 
+    _file_cache["mtime"] = mtime
+    _file_cache["data"] = data
+    return data
+
 
 def _write_file_data(data: dict) -> bool:
-    """Skriv data til konfigurasjonsfil"""
+    """Skriv data til konfigurasjonsfil.
+
+    Skriver til en temporærfil og bytter inn med os.replace, slik at et
+    krasj midt i skrivingen aldri etterlater en halvskrevet/korrupt
+    credentials-fil.
+    """
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        tmp = CONFIG_FILE.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
         if sys.platform != "win32":
-            CONFIG_FILE.chmod(0o600)
+            tmp.chmod(0o600)
+        os.replace(tmp, CONFIG_FILE)
+
+        # fsync katalogen så rename-en er holdbar ved strømbrudd (POSIX)
+        if sys.platform != "win32":
+            try:
+                dir_fd = os.open(CONFIG_FILE.parent, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+
+        # Hold lese-cachen i synk med det vi nettopp skrev
+        _file_cache["mtime"] = CONFIG_FILE.stat().st_mtime_ns
+        _file_cache["data"] = data
         return True
     except Exception as e:
         print(f"Kunne ikke lagre til fil: {e}", file=sys.stderr)
@@ -120,54 +228,150 @@ def _list_keychain_accounts() -> List[str]:
     """List kontonavn lagret i keychain"""
     if not KEYRING_AVAILABLE:
         return []
-    
-    # Keychain har ikke native "list all" - vi må tracke kontonavn i en egen nøkkel
+
+    # Keychain har ikke native "list all" - kontonavnene ligger i hvelvet
     try:
-        accounts_json = keyring.get_password(SERVICE_NAME, "_accounts")
-        if accounts_json:
-            return json.loads(accounts_json)
+        return list(_get_vault()["accounts"])
+    except Exception:
+        return []
+
+
+# Hele keychain-innholdet (kontoliste + creds) samles i én oppføring
+# "_vault", slik at både lesing og lagring av en konto koster én
+# IPC-rundtur i stedet for to-tre. Struktur:
+#   {"accounts": ["Navn", ...], "creds": {"Navn": {"t": ..., "s": ...}}}
+VAULT_KEY = "_vault"
+
+
+def _read_legacy_account(name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Les en konto fra de gamle keychain-formatene (creds-blob / to nøkler)"""
+    try:
+        blob = keyring.get_password(SERVICE_NAME, _get_keychain_key(name, "creds"))
+        if blob:
+            creds = json.loads(blob)
+            return creds.get("t"), creds.get("s")
+        token = keyring.get_password(SERVICE_NAME, _get_keychain_key(name, "token"))
+        secret = keyring.get_password(SERVICE_NAME, _get_keychain_key(name, "secret"))
+        return token, secret
+    except Exception:
+        return None, None
+
+
+def _load_vault() -> dict:
+    """
+    Les hvelvet fra keychain.
+
+    Finnes ikke "_vault"-oppføringen, bygges den fra det gamle oppsettet
+    (egen "_accounts"-liste pluss creds per konto) og skrives tilbake,
+    slik at senere lesinger koster ett oppslag.
+    """
+    try:
+        blob = keyring.get_password(SERVICE_NAME, VAULT_KEY)
+        if blob:
+            return json.loads(blob)
     except Exception:
         pass
-    return []
 
+    vault: dict = {"accounts": [], "creds": {}}
 
-def _save_keychain_account_list(accounts: List[str]) -> bool:
-    """Lagre liste over kontonavn i keychain"""
-    if not KEYRING_AVAILABLE:
-        return False
+    # Migrer fra gammelt oppsett ved første lesing
     try:
-        keyring.set_password(SERVICE_NAME, "_accounts", json.dumps(accounts))
-        return True
+        accounts_json = keyring.get_password(SERVICE_NAME, "_accounts")
+        names = json.loads(accounts_json) if accounts_json else []
     except Exception:
-        return False
+        names = []
+
+    for name in names:
+        token, secret = _read_legacy_account(name)
+        if token and secret:
+            vault["accounts"].append(name)
+            vault["creds"][name] = {"t": token, "s": secret}
+
+    if vault["accounts"]:
+        try:
+            _save_vault(vault)
+            # Rydd opp gamle nøkler når hvelvet er på plass
+            for name in names:
+                for key_type in ("creds", "token", "secret"):
+                    try:
+                        keyring.delete_password(SERVICE_NAME, _get_keychain_key(name, key_type))
+                    except Exception:
+                        pass
+            try:
+                keyring.delete_password(SERVICE_NAME, "_accounts")
+            except Exception:
+                pass
+        except Exception:
+            pass
+
+    return vault
+
+
+def _save_vault(vault: dict) -> None:
+    """Skriv hvelvet til keychain (én IPC-rundtur)"""
+    keyring.set_password(SERVICE_NAME, VAULT_KEY, json.dumps(vault))
+
+
+def _get_vault() -> dict:
+    """Hent hvelvet, cachet kort (se _cached)"""
+    return _cached("vault", _load_vault)
+
+
+def _set_creds_blob(name: str, token: str, secret: str) -> None:
+    """Lagre en konto i hvelvet - creds og kontoliste i samme skriving"""
+    current = _get_vault()
+    # Kopier så en feilet skriving ikke etterlater et mutert cache-innslag
+    vault = {"accounts": list(current["accounts"]), "creds": dict(current["creds"])}
+    vault["creds"][name] = {"t": token, "s": secret}
+    if name not in vault["accounts"]:
+        vault["accounts"].append(name)
+    _save_vault(vault)
+
+
+def _get_creds_blob(name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Les token+secret for en konto fra hvelvet (ett keychain-oppslag)"""
+    try:
+        creds = _get_vault()["creds"].get(name)
+        if creds:
+            return creds.get("t"), creds.get("s")
+    except Exception:
+        pass
+    return None, None
 
 
 # ==================== MULTI-ACCOUNT API ====================
 
-def list_accounts() -> List[str]:
+def list_accounts(sort: bool = False) -> List[str]:
     """
     List alle lagrede kontoer.
-    Sjekker både keychain og fil.
-    
+    Sjekker både keychain og fil. Resultatet caches kort (se _cached).
+
+    Args:
+        sort: Returner alfabetisk sortert (for visning)
+
     Returns:
-        Liste med kontonavn
+        Liste med kontonavn, keychain-rekkefølge først
     """
-    accounts = set()
-    
-    # Fra keychain
+    accounts = _cached("accounts", _probe_accounts)
+    return sorted(accounts) if sort else list(accounts)
+
+
+def _probe_accounts() -> List[str]:
+    # dict.fromkeys dedupliserer og bevarer rekkefølgen:
+    # keychain-kontoer først, deretter fil-kontoer
+    accounts: Dict[str, None] = {}
+
     if KEYRING_AVAILABLE:
-        keychain_accounts = _list_keychain_accounts()
-        accounts.update(keychain_accounts)
-    
-    # Fra fil
+        accounts.update(dict.fromkeys(_list_keychain_accounts()))
+
     data = _read_file_data()
     if _is_multi_account_format(data):
-        accounts.update(data.get("accounts", {}).keys())
+        accounts.update(dict.fromkeys(data.get("accounts", {}).keys()))
     elif _is_legacy_format(data):
         # Legacy format - returner som "Standard"
-        accounts.add("Standard")
-    
-    return sorted(list(accounts))
+        accounts.setdefault("Standard")
+
+    return list(accounts)
 
 
 def save_account(name: str, token: str, secret: str, prefer_keychain: bool = True) -> Tuple[bool, str]:
@@ -191,15 +395,9 @@ def save_account(name: str, token: str, secret: str, prefer_keychain: bool = Tru
     # Prøv keychain først
     if prefer_keychain and KEYRING_AVAILABLE:
         try:
-            keyring.set_password(SERVICE_NAME, _get_keychain_key(name, "token"), token)
-            keyring.set_password(SERVICE_NAME, _get_keychain_key(name, "secret"), secret)
-            
-            # Oppdater kontolisten
-            accounts = _list_keychain_accounts()
-            if name not in accounts:
-                accounts.append(name)
-                _save_keychain_account_list(accounts)
-            
+            # Oppdaterer både creds og kontolisten i samme skriving
+            _set_creds_blob(name, token, secret)
+            _invalidate_cache()
             return True, "keychain"
         except Exception as e:
             print(f"Kunne ikke lagre i keychain: {e}", file=sys.stderr)
@@ -223,6 +421,7 @@ def save_account(name: str, token: str, secret: str, prefer_keychain: bool = Tru
     data["accounts"][name] = {"token": token, "secret": secret}
     
     if _write_file_data(data):
+        _invalidate_cache()
         return True, "file"
     
     return False, "failed"
@@ -243,13 +442,9 @@ def load_account(name: str) -> Tuple[Optional[str], Optional[str]]:
     
     # Prøv keychain først
     if KEYRING_AVAILABLE:
-        try:
-            token = keyring.get_password(SERVICE_NAME, _get_keychain_key(name, "token"))
-            secret = keyring.get_password(SERVICE_NAME, _get_keychain_key(name, "secret"))
-            if token and secret:
-                return token, secret
-        except Exception:
-            pass
+        token, secret = _get_creds_blob(name)
+        if token and secret:
+            return token, secret
     
     # Prøv fil
     data = _read_file_data()
@@ -275,20 +470,28 @@ def delete_account(name: str) -> bool:
     """
     deleted = False
     
-    # Slett fra keychain
+    # Slett fra hvelvet i keychain
     if KEYRING_AVAILABLE:
         try:
-            keyring.delete_password(SERVICE_NAME, _get_keychain_key(name, "token"))
-            keyring.delete_password(SERVICE_NAME, _get_keychain_key(name, "secret"))
-            
-            accounts = _list_keychain_accounts()
-            if name in accounts:
-                accounts.remove(name)
-                _save_keychain_account_list(accounts)
-            
-            deleted = True
+            current = _get_vault()
+            if name in current["accounts"] or name in current["creds"]:
+                # Kopier så en feilet skriving ikke etterlater et mutert cache-innslag
+                vault = {"accounts": list(current["accounts"]), "creds": dict(current["creds"])}
+                vault["creds"].pop(name, None)
+                if name in vault["accounts"]:
+                    vault["accounts"].remove(name)
+                _save_vault(vault)
+                deleted = True
         except Exception:
             pass
+
+        # Rydd eventuelle legacy-nøkler for kontoen
+        for key_type in ("creds", "token", "secret"):
+            try:
+                keyring.delete_password(SERVICE_NAME, _get_keychain_key(name, key_type))
+                deleted = True
+            except Exception:
+                pass
     
     # Slett fra fil
     data = _read_file_data()
@@ -298,6 +501,8 @@ def delete_account(name: str) -> bool:
             _write_file_data(data)
             deleted = True
     
+    if deleted:
+        _invalidate_cache()
     return deleted
 
 
@@ -362,6 +567,7 @@ def migrate_single_to_multi(account_name: str = "Standard") -> Tuple[bool, str]:
         }
         
         if _write_file_data(new_data):
+            _invalidate_cache()
             return True, f"Migrert fil-credentials til konto '{account_name}'"
     
     # Sjekk for legacy keychain-data
@@ -371,16 +577,9 @@ def migrate_single_to_multi(account_name: str = "Standard") -> Tuple[bool, str]:
             secret = keyring.get_password(SERVICE_NAME, "secret")
             
             if token and secret:
-                # Lagre med nytt format
-                keyring.set_password(SERVICE_NAME, _get_keychain_key(account_name, "token"), token)
-                keyring.set_password(SERVICE_NAME, _get_keychain_key(account_name, "secret"), secret)
-                
-                # Oppdater kontolisten
-                accounts = _list_keychain_accounts()
-                if account_name not in accounts:
-                    accounts.append(account_name)
-                    _save_keychain_account_list(accounts)
-                
+                # Lagre med nytt format (creds + kontoliste i hvelvet)
+                _set_creds_blob(account_name, token, secret)
+
                 # Slett gamle nøkler
                 try:
                     keyring.delete_password(SERVICE_NAME, "token")
@@ -388,6 +587,7 @@ def migrate_single_to_multi(account_name: str = "Standard") -> Tuple[bool, str]:
                 except Exception:
                     pass
                 
+                _invalidate_cache()
                 return True, f"Migrert keychain-credentials til konto '{account_name}'"
         except Exception:
             pass
@@ -398,14 +598,24 @@ def migrate_single_to_multi(account_name: str = "Standard") -> Tuple[bool, str]:
 def needs_migration() -> bool:
     """
     Sjekk om det finnes legacy credentials som bør migreres.
-    
+    Resultatet caches kort (se _cached).
+
     Returns:
         True hvis migrering trengs
     """
+    return _cached("needs_migration", _probe_needs_migration)
+
+
+def _probe_needs_migration() -> bool:
     # Sjekk fil
     data = _read_file_data()
     if _is_legacy_format(data):
         return True
+
+    # Allerede migrert til multi-konto? Da trengs ingen keychain-probe -
+    # dette er normaltilstanden, og sparer en IPC per get_credentials_info
+    if _is_multi_account_format(data) and data.get("accounts"):
+        return False
     
     # Sjekk keychain
     if KEYRING_AVAILABLE:
@@ -485,9 +695,11 @@ def delete_credentials() -> bool:
     # Slett også legacy nøkler
     if KEYRING_AVAILABLE:
         try:
-            keyring.delete_password(SERVICE_NAME, "token")
-            keyring.delete_password(SERVICE_NAME, "secret")
-            keyring.delete_password(SERVICE_NAME, "_accounts")
+            for key in ("token", "secret", "_accounts", VAULT_KEY):
+                try:
+                    keyring.delete_password(SERVICE_NAME, key)
+                except Exception:
+                    pass
         except Exception:
             pass
     
@@ -498,6 +710,7 @@ def delete_credentials() -> bool:
     except Exception:
         pass
     
+    _invalidate_cache()
     return True
 
 
@@ -524,14 +737,7 @@ def migrate_file_to_keychain() -> Tuple[bool, str]:
         secret = creds.get("secret")
         if token and secret:
             try:
-                keyring.set_password(SERVICE_NAME, _get_keychain_key(name, "token"), token)
-                keyring.set_password(SERVICE_NAME, _get_keychain_key(name, "secret"), secret)
-                
-                accounts = _list_keychain_accounts()
-                if name not in accounts:
-                    accounts.append(name)
-                    _save_keychain_account_list(accounts)
-                
+                _set_creds_blob(name, token, secret)
                 migrated += 1
             except Exception:
                 pass
@@ -542,6 +748,7 @@ def migrate_file_to_keychain() -> Tuple[bool, str]:
             CONFIG_FILE.unlink()
         except Exception:
             pass
+        _invalidate_cache()
         return True, f"Migrert {migrated} konto(er) til keychain"
     
     return False, "Ingen kontoer ble migrert"
@@ -551,6 +758,21 @@ def get_credentials_info() -> dict:
     """
     Returner informasjon om credential-lagring.
     """
+    # Miljøvariabler har høyest prioritet - da trenger vi ikke røre
+    # keychain i det hele tatt (sparer IPC per CLI-kjøring i CI/cron)
+    if _env_has_creds():
+        return {
+            "keyring_available": KEYRING_AVAILABLE,
+            "keyring_backend": None,
+            "file_exists": CONFIG_FILE.exists(),
+            "file_path": str(CONFIG_FILE),
+            "env_configured": True,
+            "storage_type": "environment",
+            "account_count": 0,
+            "accounts": [],
+            "needs_migration": False,
+        }
+
     accounts = list_accounts()
     
     info = {
@@ -0,0 +1,171 @@
+"""
+Valgfri bakgrunnsdaemon for Domeneshop CLI
+
+Hver CLI-kjøring betaler normalt TCP- og TLS-håndtrykk mot
+api.domeneshop.no på nytt. For skriptede løkker ("for d in ...; do
+domeneshop dns list $d; done") dominerer håndtrykket kjøretiden.
+Daemonen holder en varm DomeneshopClient (med connection-pool og
+GET-cache) i en langlevd prosess; påfølgende CLI-kall sender kallene
+sine dit over en Unix-domenesokkel i stedet for å bygge egen sesjon.
+
+Eksplisitt opt-in: daemonen brukes bare når DOMENESHOP_DAEMON=1 er
+satt OG sokkelen finnes. Uten begge deler er oppførselen som før, og
+ved enhver sokkelfeil faller CLI-en tilbake til lokal kjøring.
+
+Protokoll: 4 bytes lengde (big-endian) + JSON-kropp, begge veier.
+Forespørsel: {"method", "endpoint", "data", "params", "token", "secret"}
+Svar:        {"ok": true, "result": ...} eller {"ok": false, "error": "..."}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+SOCKET_PATH = Path.home() / ".domeneshop-sock"
+
+_LEN = struct.Struct(">I")
+
+# Øvre grense for én melding; beskytter daemonen mot korrupte prefikser
+_MAX_MESSAGE = 16 * 1024 * 1024
+
+
+def daemon_enabled() -> bool:
+    """Om CLI-en skal forsøke daemonen (opt-in via miljøvariabel)"""
+    return (
+        os.environ.get("DOMENESHOP_DAEMON") == "1"
+        and hasattr(socket, "AF_UNIX")
+        and SOCKET_PATH.exists()
+    )
+
+
+def _send(sock: socket.socket, obj: Dict) -> None:
+    body = json.dumps(obj).encode()
+    sock.sendall(_LEN.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    chunks = []
+    while n:
+        chunk = sock.recv(n)
+        if not chunk:
+            raise ConnectionError("Sokkelen ble lukket midt i en melding")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict:
+    (length,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+    if length > _MAX_MESSAGE:
+        raise ConnectionError("Urimelig meldingslengde fra sokkelen")
+    return json.loads(_recv_exact(sock, length))
+
+
+def call(payload: Dict, timeout: float = 30.0) -> Dict:
+    """Send ett API-kall til daemonen og vent på svaret
+
+    Reiser OSError/ConnectionError ved sokkelproblemer, slik at kalleren
+    kan falle tilbake til lokal kjøring.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(SOCKET_PATH))
+        _send(sock, payload)
+        return _recv(sock)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            request = _recv(self.request)
+        except (ConnectionError, ValueError, OSError):
+            return
+        if request.get("cmd") == "shutdown":
+            _send(self.request, {"ok": True, "result": None})
+            # Egen tråd: shutdown() fra handler-tråden ville vrangsperre
+            import threading
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        _send(self.request, self.server.dispatch(request))
+
+
+# socketserver definerer bare Unix-serverklassene der AF_UNIX finnes;
+# på Windows må modulen likevel kunne importeres (daemonen er opt-in)
+_UnixServerBase = getattr(socketserver, "ThreadingUnixStreamServer", None)
+
+
+class DaemonServer(_UnixServerBase or object):
+    """UDS-server med én varm klient per credential-par"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        if _UnixServerBase is None:
+            raise RuntimeError("Daemonen krever Unix-domenesokler og er ikke tilgjengelig på denne plattformen")
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        if socket_path.exists():
+            socket_path.unlink()
+        super().__init__(str(socket_path), _Handler)
+        # Sokkelen bærer autentiserte kall - kun eier skal nå den
+        os.chmod(socket_path, 0o600)
+        self._socket_path = socket_path
+
+    def dispatch(self, request: Dict) -> Dict:
+        """Kjør ett API-kall mot den varme klienten for credential-paret"""
+        import click
+        from domeneshop_cli import DomeneshopClient
+
+        token = request.get("token")
+        secret = request.get("secret")
+        if not token or not secret:
+            return {"ok": False, "error": "Manglende credentials i forespørselen"}
+        client = self._clients.get((token, secret))
+        if client is None:
+            client = DomeneshopClient(token, secret)
+            self._clients[(token, secret)] = client
+        try:
+            result = client._request(
+                request.get("method", "GET"),
+                request.get("endpoint", "/"),
+                data=request.get("data"),
+                params=request.get("params"),
+            )
+            return {"ok": True, "result": result}
+        except click.ClickException as e:
+            return {"ok": False, "error": e.message}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def server_close(self):
+        super().server_close()
+        if self._socket_path.exists():
+            self._socket_path.unlink()
+
+
+def serve(socket_path: Path = SOCKET_PATH) -> None:
+    """Kjør daemonen i forgrunnen til den stoppes (Ctrl-C eller 'daemon stop')"""
+    server = DaemonServer(socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def stop() -> bool:
+    """Be en kjørende daemon om å avslutte. Returnerer om den svarte."""
+    if not SOCKET_PATH.exists():
+        return False
+    try:
+        call({"cmd": "shutdown"}, timeout=5.0)
+        return True
+    except OSError:
+        # Død daemon med etterlatt sokkel - rydd opp
+        SOCKET_PATH.unlink(missing_ok=True)
+        return False
@@ -14,11 +14,16 @@ Eller lagrede credentials via 'domeneshop configure'
 import os
 import sys
 import json
+import time
+import atexit
+import importlib.util
 import click
-import requests
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
-from tabulate import tabulate
+
+# requests importeres lazy i funksjonene som trenger den: importkostnaden
+# (~40 ms) dominerer veggtiden for cron-kjørt ddns, --help og
+# configure --status, som aldri trenger HTTP
 
 # Import av sikkerhetsmoduler
 from credentials import (
@@ -34,12 +39,119 @@ from audit import (
     log_account_selected
 )
 
+# aiohttp er valgfri - brukes for parallelle bulk-oppslag hvis installert.
+# find_spec i stedet for import: selve importen er tung (~50-100 ms) og
+# betales først når async-stien faktisk brukes, ikke på hver CLI-kjøring
+AIOHTTP_AVAILABLE = importlib.util.find_spec("aiohttp") is not None
+
+# orjson er valgfri - raskere JSON-parsing/-serialisering hvis installert
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson er valgfri - strømmende parsing av store listesvar hvis installert
+IJSON_AVAILABLE = importlib.util.find_spec("ijson") is not None
+
 # Global variabel for valgt konto
 _selected_account: Optional[str] = None
 
 # API konfigurasjon
 API_BASE_URL = "https://api.domeneshop.no/v0"
 
+# Gyldige verdier for click.Choice - delt tuple-instans i stedet for
+# nye lister per dekoratør, og gjenbrukbar for annen validering
+DNS_RECORD_TYPES = ("A", "AAAA", "CNAME", "MX", "TXT", "SRV")
+INVOICE_STATUSES = ("unpaid", "paid", "settled")
+
+# Hvor lenge en hentet DNS-post/videresending regnes som fersk nok til å
+# hoppe over GET-en før en PUT/DELETE (sparer én RTT per oppdatering)
+RECORD_CACHE_TTL = 60.0
+
+# Maksimal alder for memoiserte GET-svar (get_domains o.l.) innenfor én
+# prosess. Mutasjoner tømmer cachen uansett; TTL-en begrenser i tillegg
+# hvor lenge endringer gjort utenfra kan forbli usynlige
+GET_CACHE_TTL = 60.0
+
+# Under denne radgrensen brukes den faste-bredde-utskriften i stedet for
+# breddeberegning fra dataene (sparer to-pass-scan for vanligste tilfelle)
+FAST_TABLE_LIMIT = 20
+
+# Ferdigkompilerte endepunkt-maler; %-formatering er raskere enn
+# f-strenger ved gjentatt substitusjon i de batchede stiene
+_EP_DOMAIN = "/domains/%d"
+_EP_DNS = "/domains/%d/dns"
+_EP_DNS_RECORD = "/domains/%d/dns/%d"
+_EP_FORWARDS = "/domains/%d/forwards/"
+_EP_FORWARD = "/domains/%d/forwards/%s"
+_EP_INVOICE = "/invoices/%d"
+
+# Identiske for alle klienter - bygges én gang i stedet for per instans
+_STATIC_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    # Eksplisitt keep-alive så TLS/TCP-håndtrykket gjenbrukes på tvers
+    # av de 2-3 sekvensielle kallene de fleste kommandoene gjør
+    "Connection": "keep-alive"
+}
+
+
+def _encode_body(data: Dict) -> bytes:
+    """Serialiser utgående kropp kompakt (uten mellomrom etter , og :)
+
+    requests' json=-sti bruker stdlib-standardseparatorene og legger på
+    ~10-15 % ekstra bytes per DNS-/forward-payload; vi sender ferdig
+    serialisert via data= i stedet (Content-Type står på sesjonen).
+    """
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _auth_error(response, endpoint: str) -> click.ClickException:
+    log_auth_failure("Invalid credentials")
+    return click.ClickException("Autentisering feilet. Sjekk DOMENESHOP_TOKEN og DOMENESHOP_SECRET.")
+
+
+# Statuskode -> feilbygger; dict-oppslag i stedet for if/elif-stige, og
+# nye koder legges til som én linje
+_HTTP_ERROR_HANDLERS = {
+    401: _auth_error,
+    404: lambda response, endpoint: click.ClickException(f"Ressurs ikke funnet: {endpoint}"),
+    400: lambda response, endpoint: click.ClickException(f"Ugyldig forespørsel: {response.text}"),
+    409: lambda response, endpoint: click.ClickException(f"Konflikt: {response.text}"),
+}
+
+
+# Én delt HTTPAdapter (og dermed én urllib3-pool) for alle klienter i
+# prosessen: parallelle prober med ulike credentials (accounts test)
+# deler da TLS-forbindelsene mot api.domeneshop.no i stedet for å gjøre
+# hvert sitt håndtrykk. Basic-Auth settes per sesjon og påvirkes ikke.
+# Bygges lazy siden requests importeres lazy.
+_shared_adapter = None
+
+
+def _get_shared_adapter():
+    global _shared_adapter
+    if _shared_adapter is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Retry mot transiente feil. Alle API-verbene her er idempotente
+        # (PUT/DELETE) eller trygge å gjenta (GET), og POST mot
+        # Domeneshop-API-et feiler rent ved duplikat (409).
+        _shared_adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "PUT", "DELETE", "POST"]
+            )
+        )
+    return _shared_adapter
+
 
 class DomeneshopClient:
     """Klient for Domeneshop API"""
@@ -47,53 +159,193 @@ class DomeneshopClient:
     def __init__(self, token: str, secret: str):
         self.token = token
         self.secret = secret
-        self.session = requests.Session()
-        self.session.auth = (token, secret)
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        })
+        # Sesjonen (og dermed connection-poolen) bygges først ved første
+        # kall - en klient som bare opprettes/forkastes koster da ingenting
+        self._session = None
+        # Opt-in HTTP/2 via httpx: multipleksing av parallelle kall (ddns,
+        # list-all) over én TCP-forbindelse. Krever httpx[http2] installert
+        # og DOMENESHOP_HTTP2=1; ellers brukes requests som før.
+        self._httpx_client = None
+        self._httpx_mod = None
+        if os.environ.get("DOMENESHOP_HTTP2") == "1":
+            try:
+                import httpx
+                self._httpx_client = httpx.Client(
+                    http2=True,
+                    auth=(token, secret),
+                    base_url=API_BASE_URL,
+                    headers={"Content-Type": "application/json", "Accept": "application/json"},
+                    limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+                )
+                self._httpx_mod = httpx
+                atexit.register(self._httpx_client.close)
+            except ImportError:
+                pass
+        # Nylig hentede poster, slik at update/delete-flytene slipper
+        # GET-runden når posten allerede er lest i samme prosess
+        self._record_cache: Dict[Tuple, Tuple[float, Dict]] = {}
+        # Svar-cache for identiske GET-kall innen samme kjøring; tømmes
+        # ved første skrivende kall siden svaret da kan være utdatert
+        self._get_cache: Dict[Tuple, Any] = {}
+
+    @property
+    def session(self):
+        """Lazy-konstruert requests.Session med keep-alive-pool og retry"""
+        if self._session is None:
+            import requests
+
+            session = requests.Session()
+            session.auth = (self.token, self.secret)
+            session.headers.update(_STATIC_HEADERS)
+            session.mount("https://", _get_shared_adapter())
+            atexit.register(session.close)
+            self._session = session
+        return self._session
+
+    def _cache_get(self, key: Tuple) -> Optional[Dict]:
+        hit = self._record_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < RECORD_CACHE_TTL:
+            return hit[1]
+        return None
+
+    def _cache_put(self, key: Tuple, value: Dict) -> None:
+        self._record_cache[key] = (time.monotonic(), value)
+
+    def _get_cache_get(self, key: Tuple):
+        hit = self._get_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < GET_CACHE_TTL:
+            return hit
+        return None
+
+    def _get_cache_put(self, key: Tuple, value: Any) -> None:
+        self._get_cache[key] = (time.monotonic(), value)
 
     def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
         """Utfør HTTP-forespørsel mot API"""
+        import requests
+
         url = f"{API_BASE_URL}{endpoint}"
+        # /dyndns/update er en GET med sideeffekt og må aldri caches
+        cacheable = method == "GET" and not endpoint.startswith("/dyndns")
+        if cacheable:
+            cache_key = (url, frozenset((params or {}).items()))
+            hit = self._get_cache_get(cache_key)
+            if hit is not None:
+                return hit[1]
+        elif method != "GET":
+            self._get_cache.clear()
+        if self._httpx_client is not None:
+            conn_error = self._httpx_mod.TransportError
+        else:
+            conn_error = requests.exceptions.ConnectionError
+        # Eksplisitt statussjekk i _handle i stedet for raise_for_status:
+        # suksesstien slipper å sette opp/rive ned unntaksmaskineriet
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                params=params
-            )
-            response.raise_for_status()
-            
-            if response.status_code == 204:
-                return None
-            if response.content:
-                return response.json()
-            return None
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                log_auth_failure("Invalid credentials")
-                raise click.ClickException("Autentisering feilet. Sjekk DOMENESHOP_TOKEN og DOMENESHOP_SECRET.")
-            elif e.response.status_code == 404:
-                raise click.ClickException(f"Ressurs ikke funnet: {endpoint}")
-            elif e.response.status_code == 400:
-                raise click.ClickException(f"Ugyldig forespørsel: {e.response.text}")
-            elif e.response.status_code == 409:
-                raise click.ClickException(f"Konflikt: {e.response.text}")
+            if self._httpx_client is not None:
+                response = self._httpx_client.request(method, endpoint, json=data, params=params)
             else:
-                raise click.ClickException(f"API-feil ({e.response.status_code}): {e.response.text}")
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    data=_encode_body(data) if data is not None else None,
+                    params=params
+                )
+        except conn_error:
+            raise click.ClickException("Kunne ikke koble til Domeneshop API")
+        result = self._handle(response, endpoint)
+        if cacheable:
+            self._get_cache_put(cache_key, result)
+        return result
+
+    def _handle(self, response, endpoint: str) -> Any:
+        """Felles status-/dekodingshåndtering for verb-hjelperne"""
+        status = response.status_code
+        if status >= 400:
+            handler = _HTTP_ERROR_HANDLERS.get(status)
+            if handler:
+                raise handler(response, endpoint)
+            raise click.ClickException(f"API-feil ({status}): {response.text}")
+        # 204/Content-Length: 0 (typisk PUT/DELETE): ikke rør
+        # response.content - det tvinger les/dekomprimering av tom kropp
+        if status == 204 or response.headers.get("Content-Length") == "0":
+            return None
+        if response.content:
+            return orjson.loads(response.content) if orjson else response.json()
+        return None
+
+    # Verb-spesialiserte hjelpere: session.get/post/put/delete direkte i
+    # stedet for session.request sin metode-dispatch og kwargs-dict per
+    # kall. _request beholdes for httpx-stien og sjeldne verb (HEAD).
+
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        if self._httpx_client is not None:
+            return self._request("GET", endpoint, params=params)
+        url = API_BASE_URL + endpoint
+        # /dyndns/update er en GET med sideeffekt og må aldri caches
+        cacheable = not endpoint.startswith("/dyndns")
+        if cacheable:
+            cache_key = (url, frozenset((params or {}).items()))
+            hit = self._get_cache_get(cache_key)
+            if hit is not None:
+                return hit[1]
+        import requests
+        try:
+            response = self.session.get(url, params=params)
+        except requests.exceptions.ConnectionError:
+            raise click.ClickException("Kunne ikke koble til Domeneshop API")
+        result = self._handle(response, endpoint)
+        if cacheable:
+            self._get_cache_put(cache_key, result)
+        return result
+
+    def _post(self, endpoint: str, data: Dict) -> Any:
+        if self._httpx_client is not None:
+            return self._request("POST", endpoint, data=data)
+        self._get_cache.clear()
+        import requests
+        try:
+            response = self.session.post(API_BASE_URL + endpoint, data=_encode_body(data))
+        except requests.exceptions.ConnectionError:
+            raise click.ClickException("Kunne ikke koble til Domeneshop API")
+        return self._handle(response, endpoint)
+
+    def _put(self, endpoint: str, data: Dict) -> Any:
+        if self._httpx_client is not None:
+            return self._request("PUT", endpoint, data=data)
+        self._get_cache.clear()
+        import requests
+        try:
+            response = self.session.put(API_BASE_URL + endpoint, data=_encode_body(data))
         except requests.exceptions.ConnectionError:
             raise click.ClickException("Kunne ikke koble til Domeneshop API")
+        return self._handle(response, endpoint)
+
+    def _delete(self, endpoint: str) -> Any:
+        if self._httpx_client is not None:
+            return self._request("DELETE", endpoint)
+        self._get_cache.clear()
+        import requests
+        try:
+            response = self.session.delete(API_BASE_URL + endpoint)
+        except requests.exceptions.ConnectionError:
+            raise click.ClickException("Kunne ikke koble til Domeneshop API")
+        return self._handle(response, endpoint)
+
+    def ping(self) -> None:
+        """Lettvekts autentiserings-probe
+
+        HEAD mot /domains validerer credentials uten at API-et sender
+        (og vi parser) hele domenelisten.
+        """
+        self._request("HEAD", "/domains")
 
     # Domener
     def get_domains(self, domain_filter: Optional[str] = None) -> List[Dict]:
         params = {"domain": domain_filter} if domain_filter else None
-        return self._request("GET", "/domains", params=params)
+        return self._get("/domains", params=params)
 
     def get_domain(self, domain_id: int) -> Dict:
-        return self._request("GET", f"/domains/{domain_id}")
+        return self._get(_EP_DOMAIN % domain_id)
 
     # DNS
     def get_dns_records(self, domain_id: int, host: Optional[str] = None, record_type: Optional[str] = None) -> List[Dict]:
@@ -102,50 +354,156 @@ class DomeneshopClient:
             params["host"] = host
         if record_type:
             params["type"] = record_type
-        return self._request("GET", f"/domains/{domain_id}/dns", params=params or None)
+        return self._get(_EP_DNS % domain_id, params=params or None)
+
+    def iter_dns_records(self, domain_id: int, host: Optional[str] = None, record_type: Optional[str] = None):
+        """Iterer over DNS-poster uten å materialisere hele svaret
+
+        Med ijson parses responsen strømmende, så peak-minnet er én post
+        i stedet for hele sonen. Uten ijson faller vi tilbake til det
+        vanlige eager-kallet.
+        """
+        if not IJSON_AVAILABLE:
+            yield from self.get_dns_records(domain_id, host, record_type)
+            return
+
+        import ijson
+        import requests
+
+        params = {}
+        if host:
+            params["host"] = host
+        if record_type:
+            params["type"] = record_type
+        url = API_BASE_URL + _EP_DNS % domain_id
+        try:
+            response = self.session.get(url, params=params or None, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise click.ClickException(f"API-feil ({e.response.status_code}): {e.response.text}")
+        except requests.exceptions.ConnectionError:
+            raise click.ClickException("Kunne ikke koble til Domeneshop API")
+
+        try:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, "item")
+        finally:
+            response.close()
 
     def get_dns_record(self, domain_id: int, record_id: int) -> Dict:
-        return self._request("GET", f"/domains/{domain_id}/dns/{record_id}")
+        cached = self._cache_get(("dns", domain_id, record_id))
+        if cached is not None:
+            return cached
+        record = self._get(_EP_DNS_RECORD % (domain_id, record_id))
+        self._cache_put(("dns", domain_id, record_id), record)
+        return record
 
     def create_dns_record(self, domain_id: int, record: Dict) -> Dict:
-        return self._request("POST", f"/domains/{domain_id}/dns", data=record)
+        return self._post(_EP_DNS % domain_id, record)
 
     def update_dns_record(self, domain_id: int, record_id: int, record: Dict) -> None:
-        return self._request("PUT", f"/domains/{domain_id}/dns/{record_id}", data=record)
+        self._record_cache.pop(("dns", domain_id, record_id), None)
+        return self._put(_EP_DNS_RECORD % (domain_id, record_id), record)
 
     def delete_dns_record(self, domain_id: int, record_id: int) -> None:
-        return self._request("DELETE", f"/domains/{domain_id}/dns/{record_id}")
+        self._record_cache.pop(("dns", domain_id, record_id), None)
+        return self._delete(_EP_DNS_RECORD % (domain_id, record_id))
 
     # Forwards
     def get_forwards(self, domain_id: int) -> List[Dict]:
-        return self._request("GET", f"/domains/{domain_id}/forwards/")
+        return self._get(_EP_FORWARDS % domain_id)
 
     def get_forward(self, domain_id: int, host: str) -> Dict:
-        return self._request("GET", f"/domains/{domain_id}/forwards/{host}")
+        cached = self._cache_get(("fwd", domain_id, host))
+        if cached is not None:
+            return cached
+        fwd = self._get(_EP_FORWARD % (domain_id, host))
+        self._cache_put(("fwd", domain_id, host), fwd)
+        return fwd
 
     def create_forward(self, domain_id: int, forward: Dict) -> None:
-        return self._request("POST", f"/domains/{domain_id}/forwards/", data=forward)
+        return self._post(_EP_FORWARDS % domain_id, forward)
 
     def update_forward(self, domain_id: int, host: str, forward: Dict) -> Dict:
-        return self._request("PUT", f"/domains/{domain_id}/forwards/{host}", data=forward)
+        self._record_cache.pop(("fwd", domain_id, host), None)
+        return self._put(_EP_FORWARD % (domain_id, host), forward)
 
     def delete_forward(self, domain_id: int, host: str) -> None:
-        return self._request("DELETE", f"/domains/{domain_id}/forwards/{host}")
+        self._record_cache.pop(("fwd", domain_id, host), None)
+        return self._delete(_EP_FORWARD % (domain_id, host))
 
     # Invoices
     def get_invoices(self, status: Optional[str] = None) -> List[Dict]:
         params = {"status": status} if status else None
-        return self._request("GET", "/invoices", params=params)
+        return self._get("/invoices", params=params)
 
     def get_invoice(self, invoice_id: int) -> Dict:
-        return self._request("GET", f"/invoices/{invoice_id}")
+        return self._get(_EP_INVOICE % invoice_id)
 
     # DDNS
     def update_ddns(self, hostname: str, myip: Optional[str] = None) -> None:
         params = {"hostname": hostname}
         if myip:
             params["myip"] = myip
-        return self._request("GET", "/dyndns/update", params=params)
+        return self._get("/dyndns/update", params=params)
+
+
+class AsyncDomeneshopClient:
+    """Async-klient for bulk-oppslag mot Domeneshop API (krever aiohttp)
+
+    Speiler lese-delen av DomeneshopClient, men lar uavhengige GET-kall
+    overlappe i én event-loop. Med N domener faller veggtiden for en
+    full DNS-listing fra O(N·RTT) til ~O(RTT).
+    """
+
+    def __init__(self, token: str, secret: str):
+        self.token = token
+        self.secret = secret
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self) -> "AsyncDomeneshopClient":
+        import aiohttp
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=75),
+            auth=aiohttp.BasicAuth(self.token, self.secret),
+            headers={"Accept": "application/json"}
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._session.close()
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        async with self._session.get(f"{API_BASE_URL}{endpoint}", params=params) as resp:
+            if resp.status == 401:
+                log_auth_failure("Invalid credentials")
+                raise click.ClickException("Autentisering feilet. Sjekk DOMENESHOP_TOKEN og DOMENESHOP_SECRET.")
+            if resp.status >= 400:
+                raise click.ClickException(f"API-feil ({resp.status}): {await resp.text()}")
+            return await resp.json()
+
+    async def get_domains(self, domain_filter: Optional[str] = None) -> List[Dict]:
+        params = {"domain": domain_filter} if domain_filter else None
+        return await self._get("/domains", params=params)
+
+    async def get_dns_records(self, domain_id: int) -> List[Dict]:
+        return await self._get(f"/domains/{domain_id}/dns")
+
+
+def _gather_all_dns(token: str, secret: str) -> List[Tuple[Dict, List[Dict]]]:
+    """Hent DNS-poster for alle domener parallelt via aiohttp"""
+    import asyncio
+
+    async def _run():
+        async with AsyncDomeneshopClient(token, secret) as client:
+            domains = await client.get_domains()
+            record_lists = await asyncio.gather(
+                *[client.get_dns_records(d["id"]) for d in domains]
+            )
+            return list(zip(domains, record_lists))
+
+    return asyncio.run(_run())
 
 
 def prompt_for_credentials() -> Tuple[str, str]:
@@ -159,9 +517,23 @@ def prompt_for_credentials() -> Tuple[str, str]:
     return token, secret
 
 
+# Kontolisten endrer seg ikke i løpet av én CLI-kjøring (mutasjonene i
+# 'accounts add/remove/rename' skjer etter at listen er lest), så ett
+# keychain-oppslag per prosess holder
+_accounts_cache: Optional[List[str]] = None
+
+
+def _cached_accounts() -> List[str]:
+    """Hent kontolisten, memoisert for prosessens levetid"""
+    global _accounts_cache
+    if _accounts_cache is None:
+        _accounts_cache = list_accounts()
+    return _accounts_cache
+
+
 def select_account_interactive() -> Optional[str]:
     """Interaktiv konto-velger"""
-    accounts = list_accounts()
+    accounts = _cached_accounts()
     
     if len(accounts) == 0:
         return None
@@ -184,6 +556,68 @@ def select_account_interactive() -> Optional[str]:
             click.echo("Skriv inn et tall.")
 
 
+class _DaemonClient(DomeneshopClient):
+    """Klient som ruter API-kall via den valgfrie bakgrunnsdaemonen
+
+    Daemonen (se daemon.py) holder en varm sesjon på tvers av
+    CLI-kjøringer, så hvert kall slipper eget TCP/TLS-håndtrykk. Ved
+    enhver sokkelfeil faller kallet tilbake til lokal kjøring via
+    superklassen - daemonen er en ren optimalisering, aldri et krav.
+    """
+
+    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
+        import daemon as _daemon
+        try:
+            response = _daemon.call({
+                "method": method, "endpoint": endpoint,
+                "data": data, "params": params,
+                "token": self.token, "secret": self.secret,
+            })
+        except (OSError, ValueError):
+            return super()._request(method, endpoint, data=data, params=params)
+        if response.get("ok"):
+            return response.get("result")
+        raise click.ClickException(response.get("error", "Ukjent feil fra daemonen"))
+
+    # GET-cache og mutasjonsinvalidering bor i daemonens klient; her
+    # rutes alle verb rett gjennom _request
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        return self._request("GET", endpoint, params=params)
+
+    def _post(self, endpoint: str, data: Dict) -> Any:
+        return self._request("POST", endpoint, data=data)
+
+    def _put(self, endpoint: str, data: Dict) -> Any:
+        return self._request("PUT", endpoint, data=data)
+
+    def _delete(self, endpoint: str) -> Any:
+        return self._request("DELETE", endpoint)
+
+
+# Én klient (og dermed én connection-pool) per credential-par, så
+# gjentatte get_client()-kall i samme kjøring gjenbruker TLS-sesjonen
+_client_cache: Dict[Tuple[str, str], DomeneshopClient] = {}
+
+
+def _client_for(token: str, secret: str) -> DomeneshopClient:
+    """Hent (eller opprett) delt klient for et credential-par"""
+    client = _client_cache.get((token, secret))
+    if client is None:
+        # Daemonen er opt-in og Unix-sokkel-basert; import-/plattformfeil
+        # der skal aldri velte vanlig klientbygging (f.eks. Windows)
+        if os.environ.get("DOMENESHOP_DAEMON") == "1":
+            try:
+                import daemon as _daemon
+            except Exception:
+                _daemon = None
+            if _daemon is not None and _daemon.daemon_enabled():
+                client = _DaemonClient(token, secret)
+        if client is None:
+            client = DomeneshopClient(token, secret)
+        _client_cache[(token, secret)] = client
+    return client
+
+
 def get_client(account_name: Optional[str] = None) -> DomeneshopClient:
     """Hent API-klient med autentisering
     
@@ -191,7 +625,23 @@ def get_client(account_name: Optional[str] = None) -> DomeneshopClient:
         account_name: Navn på konto å bruke. Hvis None, bruk global valg eller velg interaktivt.
     """
     global _selected_account
-    
+
+    # Miljøvariabler er den dokumenterte primærkilden og det vanlige for
+    # CI/cron - da skal vi ikke røre fil eller keychain i det hele tatt
+    env_token = os.environ.get("DOMENESHOP_TOKEN")
+    env_secret = os.environ.get("DOMENESHOP_SECRET")
+    if env_token and env_secret and not account_name and not _selected_account:
+        return _client_for(env_token, env_secret)
+
+    # Gjenbruk allerede oppløste credentials fra Click-konteksten, så
+    # gjentatte get_client()-kall i samme kommando ikke koster nye
+    # keychain-oppslag (selve oppslaget er IPC og dominerer her)
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and ctx.obj and not account_name:
+        cached = ctx.obj.get("credentials")
+        if cached:
+            return _client_for(*cached)
+
     # Sjekk for migrering først
     if needs_migration():
         click.echo("\nEksisterende credentials funnet (gammelt format).")
@@ -204,7 +654,7 @@ def get_client(account_name: Optional[str] = None) -> DomeneshopClient:
     effective_account = account_name or _selected_account
     
     # Sjekk om vi trenger å velge interaktivt
-    accounts = list_accounts()
+    accounts = _cached_accounts()
     if len(accounts) > 1 and not effective_account:
         effective_account = select_account_interactive()
         _selected_account = effective_account
@@ -241,20 +691,70 @@ def get_client(account_name: Optional[str] = None) -> DomeneshopClient:
             log_auth_failure("Invalid credentials on first setup")
             raise click.ClickException("Autentisering feilet. Sjekk token og secret.")
 
+        if ctx is not None and ctx.obj is not None and not account_name:
+            ctx.obj["credentials"] = (token, secret)
         return client
 
-    return DomeneshopClient(token, secret)
+    if ctx is not None and ctx.obj is not None and not account_name:
+        ctx.obj["credentials"] = (token, secret)
+    return _client_for(token, secret)
 
 
 # Hjelpefunksjoner for output
 def format_json(data: Any) -> str:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
     return json.dumps(data, indent=2, ensure_ascii=False)
 
 
-def print_table(data: List[Dict], headers: List[str], keys: List[str]):
-    """Skriv ut data som tabell"""
-    rows = [[row.get(k, "") for k in keys] for row in data]
-    click.echo(tabulate(rows, headers=headers, tablefmt="simple"))
+def print_table(data: List[Dict], headers: List[str], keys: List[str],
+                widths: Optional[Tuple[int, ...]] = None):
+    """Skriv ut data som tabell
+
+    Radene mates som generator og hele tabellen skrives med én buffret
+    write, så store tabeller ikke koster en ekstra liste + én write per
+    linje.
+    """
+    if widths is not None and len(data) < FAST_TABLE_LIMIT:
+        _fast_table(headers, ([row.get(k, "") for k in keys] for row in data), widths)
+        return
+
+    rows = ([row.get(k, "") for k in keys] for row in data)
+    sys.stdout.write(_simple_table(headers, rows) + "\n")
+
+
+def _simple_table(headers: List[str], rows) -> str:
+    """Formater en tabell med kolonnebredder fra dataene
+
+    Erstatter tabulate for de to tabellformene CLI-en faktisk bruker:
+    én breddepassering og tette f-strenger i stedet for et ~30 kLoC
+    bibliotek i importgrafen.
+    """
+    rows = [["" if v is None else str(v) for v in row] for row in rows]
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    lines = ["  ".join(f"{h:<{w}}" for h, w in zip(headers, widths)).rstrip(),
+             "  ".join("-" * w for w in widths)]
+    lines.extend("  ".join(f"{c:<{w}}" for c, w in zip(row, widths)).rstrip()
+                 for row in rows)
+    return "\n".join(lines)
+
+
+def _fast_table(headers: List[str], rows, widths: Tuple[int, ...]):
+    """Skriv en fast-bredde-tabell i én passering
+
+    For små tabeller (vanligste tilfelle) er to-pass breddeberegning
+    unødvendig - faste kolonnebredder gir samme lesbarhet uten ekstra
+    skanning eller mellomliggende lister.
+    """
+    out = [" ".join(f"{h:<{w}}" for h, w in zip(headers, widths)).rstrip(),
+           " ".join("-" * w for w in widths)]
+    for row in rows:
+        out.append(" ".join(f"{str(v):<{w}}" for v, w in zip(row, widths)).rstrip())
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # CLI-grupper og kommandoer
@@ -278,7 +778,7 @@ def cli(ctx, account_name: Optional[str]):
     
     if account_name:
         # Verifiser at kontoen finnes
-        accounts = list_accounts()
+        accounts = _cached_accounts()
         if account_name not in accounts:
             raise click.ClickException(f"Konto '{account_name}' finnes ikke. Tilgjengelige: {', '.join(accounts)}")
         _selected_account = account_name
@@ -308,7 +808,7 @@ def domains_list(domain_filter: Optional[str], as_json: bool):
             return
         headers = ["ID", "Domene", "Status", "Utløper", "Fornyes"]
         keys = ["id", "domain", "status", "expiry_date", "renew"]
-        print_table(domains, headers, keys)
+        print_table(domains, headers, keys, widths=(8, 30, 12, 12, 8))
 
 
 @domains.command("show")
@@ -322,29 +822,34 @@ def domains_show(domain_id: int, as_json: bool):
     if as_json:
         click.echo(format_json(domain))
     else:
-        click.echo(f"\n{'='*50}")
-        click.echo(f"Domene: {domain.get('domain')}")
-        click.echo(f"{'='*50}")
-        click.echo(f"ID:           {domain.get('id')}")
-        click.echo(f"Status:       {domain.get('status')}")
-        click.echo(f"Registrant:   {domain.get('registrant')}")
-        click.echo(f"Registrert:   {domain.get('registered_date')}")
-        click.echo(f"Utløper:      {domain.get('expiry_date')}")
-        click.echo(f"Auto-fornyes: {'Ja' if domain.get('renew') else 'Nei'}")
-        
+        # Bygg hele blokken og skriv den med én echo (én write i stedet
+        # for et syscall per linje)
+        out = [
+            f"\n{'='*50}",
+            f"Domene: {domain.get('domain')}",
+            f"{'='*50}",
+            f"ID:           {domain.get('id')}",
+            f"Status:       {domain.get('status')}",
+            f"Registrant:   {domain.get('registrant')}",
+            f"Registrert:   {domain.get('registered_date')}",
+            f"Utløper:      {domain.get('expiry_date')}",
+            f"Auto-fornyes: {'Ja' if domain.get('renew') else 'Nei'}",
+        ]
+
         nameservers = domain.get('nameservers', [])
         if nameservers:
-            click.echo(f"\nNavneservere:")
-            for ns in nameservers:
-                click.echo(f"  - {ns}")
-        
+            out.append("\nNavneservere:")
+            out.extend(f"  - {ns}" for ns in nameservers)
+
         services = domain.get('services', {})
         if services:
-            click.echo(f"\nTjenester:")
-            click.echo(f"  Registrar: {'Ja' if services.get('registrar') else 'Nei'}")
-            click.echo(f"  DNS:       {'Ja' if services.get('dns') else 'Nei'}")
-            click.echo(f"  E-post:    {'Ja' if services.get('email') else 'Nei'}")
-            click.echo(f"  Webhotell: {services.get('webhotel', 'none')}")
+            out.append("\nTjenester:")
+            out.append(f"  Registrar: {'Ja' if services.get('registrar') else 'Nei'}")
+            out.append(f"  DNS:       {'Ja' if services.get('dns') else 'Nei'}")
+            out.append(f"  E-post:    {'Ja' if services.get('email') else 'Nei'}")
+            out.append(f"  Webhotell: {services.get('webhotel', 'none')}")
+
+        click.echo("\n".join(out))
 
 
 # === DNS ===
@@ -355,33 +860,90 @@ def dns():
 
 
 @dns.command("list")
-@click.argument("domain_id", type=int)
+@click.argument("domain_id", type=int, required=False)
+@click.option("--all", "list_all", is_flag=True, help="List DNS for alle domener (parallelt)")
 @click.option("--host", "-h", help="Filtrer på host")
 @click.option("--type", "-t", "record_type", help="Filtrer på type (A, AAAA, CNAME, MX, TXT, SRV)")
 @click.option("--json", "as_json", is_flag=True, help="Output som JSON")
-def dns_list(domain_id: int, host: Optional[str], record_type: Optional[str], as_json: bool):
-    """List DNS-poster for et domene"""
+def dns_list(domain_id: Optional[int], list_all: bool, host: Optional[str], record_type: Optional[str], as_json: bool):
+    """List DNS-poster for et domene (eller alle med --all)"""
     client = get_client()
-    records = client.get_dns_records(domain_id, host, record_type)
-    
+
+    if list_all:
+        _print_all_dns(_fetch_all_dns(client), as_json)
+        return
+
+    if domain_id is None:
+        raise click.ClickException("Oppgi DOMAIN_ID, eller bruk --all for alle domener")
+
     if as_json:
-        click.echo(format_json(records))
-    else:
+        # JSON-output trenger hele listen uansett
+        click.echo(format_json(client.get_dns_records(domain_id, host, record_type)))
+        return
+
+    from itertools import chain, islice
+
+    records = client.iter_dns_records(domain_id, host, record_type)
+    head = list(islice(records, FAST_TABLE_LIMIT))
+    if not head:
+        click.echo("Ingen DNS-poster funnet.")
+        return
+
+    headers = ["ID", "Type", "Host", "Data", "TTL", "Pri"]
+    cols = ("id", "type", "host", "data", "ttl", "priority")
+    rows = ([r.get(k, "") for k in cols] for r in chain(head, records))
+
+    if len(head) < FAST_TABLE_LIMIT:
+        # Liten sone (vanligste tilfelle): fast bredde, én passering
+        _fast_table(headers, rows, (8, 6, 24, 40, 6, 4))
+        return
+
+    click.echo(_simple_table(headers, rows))
+
+
+def _fetch_all_dns(client: DomeneshopClient) -> List[Tuple[Dict, List[Dict]]]:
+    """Hent (domene, DNS-poster) for alle domener parallelt
+
+    aiohttp-stien brukes når den finnes; ellers fan-out med tråder over
+    den delte connection-poolen.
+    """
+    if AIOHTTP_AVAILABLE:
+        return _gather_all_dns(client.token, client.secret)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    domains = client.get_domains()
+    if not domains:
+        return []
+    with ThreadPoolExecutor(max_workers=min(10, len(domains))) as ex:
+        return list(ex.map(lambda d: (d, client.get_dns_records(d["id"])), domains))
+
+
+def _print_all_dns(results: List[Tuple[Dict, List[Dict]]], as_json: bool) -> None:
+    """Skriv ut full DNS-dump, én seksjon per domene"""
+    if as_json:
+        payload = [{"domain": d, "records": records} for d, records in results]
+        click.echo(format_json(payload))
+        return
+
+    for domain, records in results:
+        click.echo(f"\n{domain.get('domain')} (#{domain.get('id')})")
+        click.echo(f"{'='*50}")
         if not records:
-            click.echo("Ingen DNS-poster funnet.")
-            return
+            click.echo("  Ingen DNS-poster.")
+            continue
         headers = ["ID", "Type", "Host", "Data", "TTL", "Pri"]
-        rows = []
-        for r in records:
-            rows.append([
-                r.get("id"),
-                r.get("type"),
-                r.get("host"),
-                r.get("data"),
-                r.get("ttl"),
-                r.get("priority", "")
-            ])
-        click.echo(tabulate(rows, headers=headers, tablefmt="simple"))
+        cols = ("id", "type", "host", "data", "ttl", "priority")
+        rows = ([r.get(k, "") for k in cols] for r in records)
+        click.echo(_simple_table(headers, rows))
+
+
+@dns.command("list-all")
+@click.option("--json", "as_json", is_flag=True, help="Output som JSON")
+def dns_list_all(as_json: bool):
+    """List DNS-poster for alle domener (alias for 'dns list --all')"""
+    client = get_client()
+    _print_all_dns(_fetch_all_dns(client), as_json)
 
 
 @dns.command("show")
@@ -396,16 +958,15 @@ def dns_show(domain_id: int, record_id: int, as_json: bool):
     if as_json:
         click.echo(format_json(record))
     else:
-        click.echo(f"\nDNS-post #{record.get('id')}")
-        click.echo(f"{'='*40}")
-        for key, value in record.items():
-            click.echo(f"{key}: {value}")
+        lines = [f"\nDNS-post #{record.get('id')}", f"{'='*40}"]
+        lines.extend(f"{key}: {value}" for key, value in record.items())
+        click.echo("\n".join(lines))
 
 
 @dns.command("add")
 @click.argument("domain_id", type=int)
 @click.option("--type", "-t", "record_type", required=True, 
-              type=click.Choice(["A", "AAAA", "CNAME", "MX", "TXT", "SRV"]),
+              type=click.Choice(DNS_RECORD_TYPES),
               help="DNS-posttype")
 @click.option("--host", "-h", required=True, help="Host/subdomene (@ for rot)")
 @click.option("--data", "-d", required=True, help="Verdi (IP, hostname, tekst)")
@@ -445,34 +1006,62 @@ def dns_add(domain_id: int, record_type: str, host: str, data: str, ttl: int,
 @dns.command("update")
 @click.argument("domain_id", type=int)
 @click.argument("record_id", type=int)
+@click.option("--type", "-t", "record_type", type=click.Choice(DNS_RECORD_TYPES),
+              help="Posttype (oppgis alle felter, hoppes GET-en over)")
 @click.option("--host", "-h", help="Ny host/subdomene")
 @click.option("--data", "-d", help="Ny verdi")
 @click.option("--ttl", type=int, help="Ny TTL")
 @click.option("--priority", "-p", type=int, help="Ny prioritet")
 @click.option("--weight", "-w", type=int, help="Ny vekt")
 @click.option("--port", type=int, help="Ny port")
-def dns_update(domain_id: int, record_id: int, host: Optional[str], data: Optional[str],
+def dns_update(domain_id: int, record_id: int, record_type: Optional[str],
+               host: Optional[str], data: Optional[str],
                ttl: Optional[int], priority: Optional[int], weight: Optional[int], port: Optional[int]):
-    """Oppdater en DNS-post"""
+    """Oppdater en DNS-post
+
+    Oppgis alle felter for posttypen (--type, --host, --data, --ttl,
+    pluss --priority for MX og --priority/--weight/--port for SRV)
+    sendes PUT-en direkte uten å hente posten først.
+    """
     client = get_client()
-    
-    # Hent eksisterende post først
-    existing = client.get_dns_record(domain_id, record_id)
-    
-    # Oppdater kun angitte felt
-    if host is not None:
-        existing["host"] = host
-    if data is not None:
-        existing["data"] = data
-    if ttl is not None:
-        existing["ttl"] = ttl
-    if priority is not None:
-        existing["priority"] = priority
-    if weight is not None:
-        existing["weight"] = weight
-    if port is not None:
-        existing["port"] = port
-    
+
+    # Full erstatning? Da kan GET-runden hoppes over - kommandoen vet
+    # allerede alt API-et trenger
+    full_replacement = (
+        record_type is not None and host is not None
+        and data is not None and ttl is not None
+        and (record_type != "MX" or priority is not None)
+        and (record_type != "SRV"
+             or (priority is not None and weight is not None and port is not None))
+    )
+
+    if full_replacement:
+        existing = {"type": record_type, "host": host, "data": data, "ttl": ttl}
+        if record_type == "MX":
+            existing["priority"] = priority
+        elif record_type == "SRV":
+            existing["priority"] = priority
+            existing["weight"] = weight
+            existing["port"] = port
+    else:
+        # Hent eksisterende post og oppdater kun angitte felt
+        existing = client.get_dns_record(domain_id, record_id)
+
+        if record_type is not None:
+            existing["type"] = record_type
+        if host is not None:
+            existing["host"] = host
+        if data is not None:
+            existing["data"] = data
+        if ttl is not None:
+            existing["ttl"] = ttl
+        if priority is not None:
+            existing["priority"] = priority
+        if weight is not None:
+            existing["weight"] = weight
+        if port is not None:
+            existing["port"] = port
+
     client.update_dns_record(domain_id, record_id, existing)
     log_dns_change("update", domain_id, record_id, existing.get("type"))
     click.echo(f"✓ DNS-post #{record_id} oppdatert")
@@ -485,23 +1074,26 @@ def dns_update(domain_id: int, record_id: int, host: Optional[str], data: Option
 def dns_delete(domain_id: int, record_id: int, yes: bool):
     """Slett en DNS-post"""
     client = get_client()
-    
-    if not yes:
-        # Vis hva som skal slettes
+
+    if yes:
+        # --yes: GET-en fantes kun for visning/logg - slett direkte og
+        # spar en hel rundtur (typen utelates da fra audit-loggen)
+        record_type = None
+    else:
+        # Vis hva som skal slettes; samme svar gjenbrukes for loggingen
         record = client.get_dns_record(domain_id, record_id)
         click.echo(f"\nDu er i ferd med å slette:")
         click.echo(f"  Type: {record.get('type')}")
         click.echo(f"  Host: {record.get('host')}")
         click.echo(f"  Data: {record.get('data')}")
-        
+
         if not click.confirm("\nEr du sikker?"):
             click.echo("Avbrutt.")
             return
-    
-    # Hent type for logging før sletting
-    record = client.get_dns_record(domain_id, record_id)
+        record_type = record.get("type")
+
     client.delete_dns_record(domain_id, record_id)
-    log_dns_change("delete", domain_id, record_id, record.get("type"))
+    log_dns_change("delete", domain_id, record_id, record_type)
     click.echo(f"✓ DNS-post #{record_id} slettet")
 
 
@@ -528,7 +1120,7 @@ def forwards_list(domain_id: int, as_json: bool):
             return
         headers = ["Host", "URL", "Frame"]
         keys = ["host", "url", "frame"]
-        print_table(fwds, headers, keys)
+        print_table(fwds, headers, keys, widths=(20, 40, 6))
 
 
 @forwards.command("show")
@@ -543,11 +1135,13 @@ def forwards_show(domain_id: int, host: str, as_json: bool):
     if as_json:
         click.echo(format_json(fwd))
     else:
-        click.echo(f"\nVideresending for '{host}'")
-        click.echo(f"{'='*40}")
-        click.echo(f"Host:  {fwd.get('host')}")
-        click.echo(f"URL:   {fwd.get('url')}")
-        click.echo(f"Frame: {'Ja' if fwd.get('frame') else 'Nei'}")
+        click.echo("\n".join([
+            f"\nVideresending for '{host}'",
+            f"{'='*40}",
+            f"Host:  {fwd.get('host')}",
+            f"URL:   {fwd.get('url')}",
+            f"Frame: {'Ja' if fwd.get('frame') else 'Nei'}",
+        ]))
 
 
 @forwards.command("add")
@@ -620,7 +1214,7 @@ def invoices():
 
 
 @invoices.command("list")
-@click.option("--status", "-s", type=click.Choice(["unpaid", "paid", "settled"]),
+@click.option("--status", "-s", type=click.Choice(INVOICE_STATUSES),
               help="Filtrer på status")
 @click.option("--json", "as_json", is_flag=True, help="Output som JSON")
 def invoices_list(status: Optional[str], as_json: bool):
@@ -635,18 +1229,8 @@ def invoices_list(status: Optional[str], as_json: bool):
             click.echo("Ingen fakturaer funnet.")
             return
         headers = ["ID", "Type", "Beløp", "Valuta", "Status", "Utstedt", "Forfaller"]
-        rows = []
-        for inv in invs:
-            rows.append([
-                inv.get("id"),
-                inv.get("type"),
-                inv.get("amount"),
-                inv.get("currency"),
-                inv.get("status"),
-                inv.get("issued_date"),
-                inv.get("due_date", "")
-            ])
-        click.echo(tabulate(rows, headers=headers, tablefmt="simple"))
+        keys = ["id", "type", "amount", "currency", "status", "issued_date", "due_date"]
+        print_table(invs, headers, keys, widths=(8, 10, 10, 6, 8, 12, 12))
 
 
 @invoices.command("show")
@@ -660,18 +1244,21 @@ def invoices_show(invoice_id: int, as_json: bool):
     if as_json:
         click.echo(format_json(inv))
     else:
-        click.echo(f"\nFaktura #{inv.get('id')}")
-        click.echo(f"{'='*40}")
-        click.echo(f"Type:       {inv.get('type')}")
-        click.echo(f"Beløp:      {inv.get('amount')} {inv.get('currency')}")
-        click.echo(f"Status:     {inv.get('status')}")
-        click.echo(f"Utstedt:    {inv.get('issued_date')}")
+        out = [
+            f"\nFaktura #{inv.get('id')}",
+            f"{'='*40}",
+            f"Type:       {inv.get('type')}",
+            f"Beløp:      {inv.get('amount')} {inv.get('currency')}",
+            f"Status:     {inv.get('status')}",
+            f"Utstedt:    {inv.get('issued_date')}",
+        ]
         if inv.get('due_date'):
-            click.echo(f"Forfaller:  {inv.get('due_date')}")
+            out.append(f"Forfaller:  {inv.get('due_date')}")
         if inv.get('paid_date'):
-            click.echo(f"Betalt:     {inv.get('paid_date')}")
+            out.append(f"Betalt:     {inv.get('paid_date')}")
         if inv.get('url'):
-            click.echo(f"\nURL: {inv.get('url')}")
+            out.append(f"\nURL: {inv.get('url')}")
+        click.echo("\n".join(out))
 
 
 # === DDNS ===
@@ -691,9 +1278,20 @@ def ddns(hostnames: str, ips: Optional[str]):
       domeneshop ddns www.example.com --ip "1.2.3.4,2001:db8::1"
     """
     client = get_client()
-    client.update_ddns(hostnames, ips)
 
-    hostname_list = hostnames.split(",")
+    hostname_list = [h.strip() for h in hostnames.split(",") if h.strip()]
+    if not hostname_list:
+        raise click.ClickException("Ingen gyldige hostnames oppgitt")
+    if len(hostname_list) > 1:
+        # Uavhengige oppdateringer mot samme host: kjør dem parallelt over
+        # den delte connection-poolen, så N·RTT kollapser til ~1·RTT
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(10, len(hostname_list))) as ex:
+            list(ex.map(lambda h: client.update_ddns(h, ips), hostname_list))
+    else:
+        client.update_ddns(hostname_list[0], ips)
+
     if ips:
         ip_list = ips.split(",")
         for h in hostname_list:
@@ -813,7 +1411,8 @@ def accounts():
 @accounts.command("list")
 def accounts_list():
     """List alle lagrede kontoer"""
-    account_names = list_accounts()
+    # Visning: alfabetisk er lettere å skumme enn keychain-rekkefølgen
+    account_names = list_accounts(sort=True)
     
     if not account_names:
         click.echo("Ingen kontoer konfigurert.")
@@ -822,15 +1421,21 @@ def accounts_list():
     
     info = get_credentials_info()
     current = info.get("storage_type", "none")
-    
-    click.echo(f"\nKontoer ({len(account_names)} stk):")
-    click.echo(f"{'='*40}")
+
+    lines = [f"\nKontoer ({len(account_names)} stk):", f"{'='*40}"]
+    # Marker hvis dette er eneste konto - avgjøres én gang, ikke per rad
+    marker = " ← aktiv" if len(account_names) == 1 else ""
     for i, name in enumerate(account_names, 1):
-        # Marker hvis dette er eneste/valgte konto
-        marker = " ← aktiv" if len(account_names) == 1 else ""
-        click.echo(f"  {i}. {name}{marker}")
-    
-    click.echo(f"\nLagring: {current}")
+        lines.append(f"  {i}. {name}{marker}")
+    lines.append(f"\nLagring: {current}")
+    click.echo("\n".join(lines))
+
+
+# Samme whitelist som GUI-ets sti-parametre: kontoer med andre tegn kan
+# ikke administreres via /api/accounts/<name> og strander i web-GUI-et
+def _valid_account_name(name: str) -> bool:
+    import re
+    return bool(name and re.fullmatch(r"[A-Za-z0-9æøåÆØÅ ._-]{1,64}", name))
 
 
 @accounts.command("add")
@@ -845,8 +1450,11 @@ def accounts_add(name: str, token: Optional[str], secret: Optional[str]):
       domeneshop accounts add "Firma AS"
       domeneshop accounts add Privat --token xxx --secret yyy
     """
-    # Sjekk at navnet ikke er brukt
-    existing = list_accounts()
+    if not _valid_account_name(name):
+        raise click.ClickException("Ugyldig kontonavn (tillatt: bokstaver, tall, mellomrom, . _ -)")
+
+    # Sjekk at navnet ikke er brukt (set: O(1)-oppslag)
+    existing = set(_cached_accounts())
     if name in existing:
         raise click.ClickException(f"Konto '{name}' finnes allerede")
     
@@ -860,13 +1468,12 @@ def accounts_add(name: str, token: Optional[str], secret: Optional[str]):
         if not secret:
             secret = click.prompt("API-secret", type=str, hide_input=True)
     
-    # Test credentials
+    # Test credentials med lettvekts-probe (ingen kropp å laste ned/parses)
     client = DomeneshopClient(token, secret)
     try:
-        domains = client.get_domains()
-        domain_count = len(domains) if domains else 0
+        client.ping()
         log_auth_success()
-        click.echo(f"\n✓ Autentisering vellykket! ({domain_count} domener)")
+        click.echo("\n✓ Autentisering vellykket!")
     except Exception:
         log_auth_failure(f"Invalid credentials for account {name}")
         raise click.ClickException("Autentisering feilet. Sjekk token og secret.")
@@ -891,7 +1498,7 @@ def accounts_remove(name: str, yes: bool):
       domeneshop accounts remove "Firma AS"
       domeneshop accounts remove Privat -y
     """
-    existing = list_accounts()
+    existing = set(_cached_accounts())
     if name not in existing:
         raise click.ClickException(f"Konto '{name}' finnes ikke")
     
@@ -918,6 +1525,8 @@ def accounts_rename(old_name: str, new_name: str):
     Eksempler:
       domeneshop accounts rename "Gammelt Navn" "Nytt Navn"
     """
+    if not _valid_account_name(new_name):
+        raise click.ClickException("Ugyldig kontonavn (tillatt: bokstaver, tall, mellomrom, . _ -)")
     success, message = rename_account(old_name, new_name)
     if success:
         log_account_renamed(old_name, new_name)
@@ -939,7 +1548,7 @@ def accounts_test(name: Optional[str]):
     if name:
         account_names = [name]
     else:
-        account_names = list_accounts()
+        account_names = _cached_accounts()
     
     if not account_names:
         click.echo("Ingen kontoer å teste.")
@@ -947,20 +1556,61 @@ def accounts_test(name: Optional[str]):
     
     click.echo(f"\nTester {len(account_names)} konto(er)...")
     click.echo(f"{'='*50}")
-    
-    for account in account_names:
+
+    def _probe(account: str) -> str:
         token, secret = load_account(account)
         if not token or not secret:
-            click.echo(f"  ✗ {account}: Kunne ikke laste credentials")
-            continue
-        
+            return f"  ✗ {account}: Kunne ikke laste credentials"
+
         try:
             client = DomeneshopClient(token, secret)
             domains = client.get_domains()
             domain_count = len(domains) if domains else 0
-            click.echo(f"  ✓ {account}: OK ({domain_count} domener)")
+            return f"  ✓ {account}: OK ({domain_count} domener)"
         except Exception as e:
-            click.echo(f"  ✗ {account}: Feil - {e}")
+            return f"  ✗ {account}: Feil - {e}"
+
+    # Uavhengige prober mot samme API: kjør dem parallelt (hver tråd har
+    # sin egen klient/sesjon), ex.map bevarer utskriftsrekkefølgen
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(10, len(account_names))) as ex:
+        for line in ex.map(_probe, account_names):
+            click.echo(line)
+
+
+@cli.group("daemon")
+def daemon_group():
+    """Bakgrunnsdaemon som holder API-sesjonen varm (opt-in)"""
+    pass
+
+
+@daemon_group.command("start")
+def daemon_start():
+    """Start daemonen i forgrunnen
+
+    \b
+    Påfølgende CLI-kall bruker daemonen når DOMENESHOP_DAEMON=1 er satt:
+      domeneshop daemon start &
+      export DOMENESHOP_DAEMON=1
+      for d in $(...); do domeneshop dns list $d; done
+    """
+    import daemon as _daemon
+    try:
+        click.echo(f"Daemon lytter på {_daemon.SOCKET_PATH} (Ctrl-C for å stoppe)")
+        _daemon.serve()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+
+@daemon_group.command("stop")
+def daemon_stop():
+    """Stopp en kjørende daemon"""
+    import daemon as _daemon
+    if _daemon.stop():
+        click.echo("✓ Daemon stoppet")
+    else:
+        click.echo("Ingen kjørende daemon funnet.")
 
 
 if __name__ == "__main__":
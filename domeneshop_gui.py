@@ -14,14 +14,24 @@ Sikkerhetsfunksjoner:
 
 import os
 import sys
+import json
 import re
 import secrets
+import threading
 import time
 from pathlib import Path
 from functools import wraps
 from datetime import timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import Flask, g, render_template, request, redirect, url_for, session
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson er valgfri - raskere JSON-parsing/-serialisering hvis installert
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import av sikkerhetsmoduler
 from credentials import (
@@ -45,16 +55,29 @@ SECRET_KEY_FILE = Path.home() / ".domeneshop-gui-secret"
 
 app = Flask(__name__)
 
+
+def j(payload, status: int = 200):
+    """jsonify-erstatning: serialiser med orjson (C-utvidelse) når den finnes
+
+    Endepunktene her parser upstream-JSON og re-serialiserer til
+    nettleseren; orjson kutter begge rundene med 3-10x mot stdlib.
+    """
+    body = orjson.dumps(payload) if orjson else json.dumps(payload)
+    return app.response_class(body, status=status, mimetype="application/json")
+
 # ==================== SESSION-SIKKERHET ====================
 
 def get_or_create_secret_key() -> bytes:
     """Hent eller opprett persistent secret key"""
-    if SECRET_KEY_FILE.exists():
-        try:
-            return SECRET_KEY_FILE.read_bytes()
-        except Exception:
-            pass
-    
+    # Les direkte og håndter manglende fil via unntaket: sparer
+    # exists()-statkallet og unngår TOCTOU-vinduet mellom sjekk og les
+    try:
+        return SECRET_KEY_FILE.read_bytes()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        pass
+
     # Generer ny secret key
     secret = secrets.token_bytes(32)
     try:
@@ -82,7 +105,49 @@ app.config.update(
 
 # ==================== RATE LIMITING ====================
 
-rate_limit_store: dict = {}  # {ip: [timestamp, ...]}
+# Token-bucket per IP: [tokens, siste_tidsstempel]. Konstant minne per
+# IP og to flyttallsoperasjoner per forespørsel, uavhengig av trafikk -
+# ingen liste over tidsstempler å vedlikeholde
+rate_limit_store: dict = {}  # {ip: [tokens, last_ts]}
+
+# Stripede låser: flertrådede WSGI-servere (waitress/gunicorn --threads)
+# muterer storen samtidig, og én global lås ville serialisert alle IP-er.
+# 64 striper indeksert på hash(ip) gir trygghet uten nevneverdig contention.
+_RL_LOCKS = [threading.Lock() for _ in range(64)]
+
+# Bøtter som har stått urørt lenge feies ut av en bakgrunnsjanitor så
+# dicten ikke vokser ubegrenset over mange ulike IP-er - hotpathen
+# slipper dermed feiearbeidet helt
+_RL_IDLE_SECONDS = 600.0
+_RL_JANITOR_INTERVAL = 300.0
+_rl_janitor_started = False
+_rl_janitor_lock = threading.Lock()
+
+
+def _rl_janitor():
+    """Fei ut bøtter som har stått urørt lenge; replanlegger seg selv"""
+    now = time.time()
+    for ip in list(rate_limit_store):
+        with _RL_LOCKS[hash(ip) & 63]:
+            bucket = rate_limit_store.get(ip)
+            if bucket is not None and now - bucket[1] > _RL_IDLE_SECONDS:
+                del rate_limit_store[ip]
+    timer = threading.Timer(_RL_JANITOR_INTERVAL, _rl_janitor)
+    timer.daemon = True
+    timer.start()
+
+
+def _ensure_rl_janitor():
+    """Start janitoren ved første rate-limiterte forespørsel"""
+    global _rl_janitor_started
+    if _rl_janitor_started:
+        return
+    with _rl_janitor_lock:
+        if not _rl_janitor_started:
+            _rl_janitor_started = True
+            timer = threading.Timer(_RL_JANITOR_INTERVAL, _rl_janitor)
+            timer.daemon = True
+            timer.start()
 
 
 def rate_limit(max_requests: int = 5, window_seconds: int = 60):
@@ -90,32 +155,31 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 60):
     Rate limiting dekorator.
     Begrenser antall forespørsler per IP-adresse.
     """
+    # Påfyllingsrate beregnes én gang per dekorert funksjon
+    refill_rate = max_requests / window_seconds
+
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
+            _ensure_rl_janitor()
             ip = get_client_ip() or "unknown"
             now = time.time()
-            
-            # Rydd opp gamle entries
-            if ip in rate_limit_store:
-                rate_limit_store[ip] = [
-                    t for t in rate_limit_store[ip] 
-                    if now - t < window_seconds
-                ]
-            else:
-                rate_limit_store[ip] = []
-            
-            # Sjekk rate limit
-            if len(rate_limit_store[ip]) >= max_requests:
+
+            # Kritisk seksjon: ren flyttallsaritmetikk på to felter
+            with _RL_LOCKS[hash(ip) & 63]:
+                bucket = rate_limit_store.setdefault(ip, [float(max_requests), now])
+                tokens = min(float(max_requests), bucket[0] + (now - bucket[1]) * refill_rate)
+                limited = tokens < 1.0
+                bucket[0] = tokens if limited else tokens - 1.0
+                bucket[1] = now
+
+            if limited:
                 log_rate_limit(ip, request.path)
-                return jsonify({
+                return j({
                     "error": "For mange forespørsler. Vent litt før du prøver igjen.",
                     "retry_after": window_seconds
                 }), 429
-            
-            # Registrer forespørsel
-            rate_limit_store[ip].append(now)
-            
+
             return f(*args, **kwargs)
         return wrapper
     return decorator
@@ -125,74 +189,142 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 60):
 
 def generate_csrf_token() -> str:
     """Generer CSRF-token for session"""
-    if 'csrf_token' not in session:
-        session['csrf_token'] = secrets.token_hex(32)
-    return session['csrf_token']
+    # Kalles både fra context-processoren (per template-render) og
+    # /api/csrf-token; cache på g så resten av forespørselen er ett
+    # attributtoppslag i stedet for session-oppslag
+    token = g.get('_csrf_token')
+    if token is not None:
+        return token
+
+    token = session.get('csrf_token')
+    if token is None:
+        # 128 bits er kryptografisk rikelig for et sesjonsbundet
+        # CSRF-token; halverer entropi-uttaket og cookie-bidraget
+        token = secrets.token_hex(16)
+        session['csrf_token'] = token
+        # Bytes-varianten lagres også: compare_digest på bytes slipper
+        # ASCII-sjekken str-varianten gjør per sammenligning
+        session['csrf_token_b'] = token.encode('ascii')
+    g._csrf_token = token
+    return token
 
 
 def validate_csrf_token() -> bool:
     """Valider CSRF-token fra request"""
     token_from_request = request.headers.get('X-CSRF-Token') or \
-                         (request.json or {}).get('csrf_token')
-    token_from_session = session.get('csrf_token')
-    
-    if not token_from_request or not token_from_session:
+                         (g.get('body') or {}).get('csrf_token')
+    if not token_from_request:
         return False
-    
-    return secrets.compare_digest(token_from_request, token_from_session)
+
+    # token_hex(16) gir alltid 32 tegn (64 for tokens fra eldre
+    # sesjoner) - avvis andre lengder før encoding og sammenligning
+    if len(token_from_request) not in (32, 64):
+        return False
+
+    token_bytes = session.get('csrf_token_b')
+    if token_bytes is None:
+        # Eldre sesjoner fra før bytes-varianten ble lagret
+        token_str = session.get('csrf_token')
+        if not token_str:
+            return False
+        token_bytes = token_str.encode('ascii')
+
+    try:
+        request_bytes = token_from_request.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+
+    return secrets.compare_digest(request_bytes, token_bytes)
 
 
 def csrf_protect(f):
-    """CSRF-beskyttelse dekorator for POST/PUT/DELETE"""
+    """CSRF-beskyttelse for ruter som kun registreres for POST/PUT/DELETE
+
+    Alle muterende ruter i modulen registreres bare for usikre metoder,
+    så valideringen kjøres ubetinget - metodesjekken per kall er
+    overflødig. Får vi en rute som også tar GET, må den metodesjekken
+    tilbake for den ruten.
+    """
     @wraps(f)
     def wrapper(*args, **kwargs):
-        if request.method in ('POST', 'PUT', 'DELETE'):
-            if not validate_csrf_token():
-                log_csrf_failure(get_client_ip(), request.path)
-                return jsonify({"error": "Ugyldig CSRF-token"}), 403
+        if not validate_csrf_token():
+            log_csrf_failure(get_client_ip(), request.path)
+            return j({"error": "Ugyldig CSRF-token"}), 403
         return f(*args, **kwargs)
     return wrapper
 
 
 # ==================== INPUT-VALIDERING ====================
 
+# Kompilert én gang ved modullast - validatorene kjøres per auth-kall,
+# og re.match med literal-mønster betaler LRU-oppslag+hashing hver gang.
+# fullmatch gjør ankrene i mønsteret overflødige.
+_CREDENTIAL_RE = re.compile(r'[a-zA-Z0-9_-]+')
+
+
 def validate_token_format(token: str) -> bool:
     """Valider at token har gyldig format"""
     if not token or len(token) < 10 or len(token) > 200:
         return False
     # Domeneshop tokens er typisk alfanumeriske
-    return bool(re.match(r'^[a-zA-Z0-9_-]+$', token))
+    return bool(_CREDENTIAL_RE.fullmatch(token))
 
 
 def validate_secret_format(secret: str) -> bool:
     """Valider at secret har gyldig format"""
     if not secret or len(secret) < 10 or len(secret) > 200:
         return False
-    return bool(re.match(r'^[a-zA-Z0-9_-]+$', secret))
+    return bool(_CREDENTIAL_RE.fullmatch(secret))
+
+
+# Billig sanity-sjekk av sti-parametre før de når keychain/fil: åpenbart
+# ugyldige verdier avvises uten lagrings-I/O. Kontonavn kan inneholde
+# mellomrom og norske tegn ("Firma AS"); host dekker @ for rot og punycode.
+_ACCOUNT_NAME_RE = re.compile(r'[A-Za-z0-9æøåÆØÅ ._-]{1,64}')
+_HOST_RE = re.compile(r'[A-Za-z0-9@._-]{1,255}')
+
+
+def _valid_account_name(name: str) -> bool:
+    return bool(name and _ACCOUNT_NAME_RE.fullmatch(name))
+
+
+def _valid_host(host: str) -> bool:
+    return bool(host and _HOST_RE.fullmatch(host))
 
 
 # ==================== API-KLIENT ====================
 
+# Én delt sesjon (og dermed én keep-alive/TLS-pool) for hele GUI-et:
+# get_client() bygger en klient per forespørsel, og uten delt pool
+# betalte hvert eneste API-kall nytt TCP+TLS-håndtrykk mot
+# api.domeneshop.no. Auth settes per kall siden kontoer kan variere.
+_HTTP = requests.Session()
+_HTTP.headers.update({
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+})
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+
+
 class DomeneshopClient:
     """Klient for Domeneshop API"""
 
     def __init__(self, token: str, secret: str):
         self.token = token
         self.secret = secret
-        self.session = requests.Session()
-        self.session.auth = (token, secret)
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        })
 
     def _request(self, method: str, endpoint: str, data=None, params=None):
         """Utfør HTTP-forespørsel mot API"""
         url = f"{API_BASE_URL}{endpoint}"
         try:
-            response = self.session.request(
+            response = _HTTP.request(
                 method=method,
                 url=url,
+                auth=(self.token, self.secret),
                 json=data,
                 params=params
             )
@@ -201,7 +333,8 @@ class DomeneshopClient:
             if response.status_code == 204:
                 return None
             if response.content:
-                return response.json()
+                # orjson parser 3-10x raskere enn stdlib på store svar
+                return orjson.loads(response.content) if orjson else response.json()
             return None
             
         except requests.exceptions.HTTPError as e:
@@ -210,13 +343,78 @@ class DomeneshopClient:
         except requests.exceptions.ConnectionError:
             raise Exception("Kunne ikke koble til Domeneshop API")
 
+    def _handle(self, response):
+        """Felles status-/dekodingshåndtering for verbhjelperne"""
+        if response.status_code >= 400:
+            raise Exception(f"API-feil ({response.status_code}): {response.text}")
+        if response.status_code == 204:
+            return None
+        if response.content:
+            # orjson parser 3-10x raskere enn stdlib på store svar
+            return orjson.loads(response.content) if orjson else response.json()
+        return None
+
+    # Verbspesialiserte hjelpere (samme mønster som CLI-klienten):
+    # _HTTP.get/post/put/delete direkte i stedet for request() sin
+    # metode-dispatch og kwargs-dict per kall
+
+    def _get(self, endpoint: str, params=None):
+        try:
+            response = _HTTP.get(API_BASE_URL + endpoint,
+                                 auth=(self.token, self.secret), params=params)
+        except requests.exceptions.ConnectionError:
+            raise Exception("Kunne ikke koble til Domeneshop API")
+        return self._handle(response)
+
+    def _post(self, endpoint: str, data: dict):
+        try:
+            response = _HTTP.post(API_BASE_URL + endpoint,
+                                  auth=(self.token, self.secret), json=data)
+        except requests.exceptions.ConnectionError:
+            raise Exception("Kunne ikke koble til Domeneshop API")
+        return self._handle(response)
+
+    def _put(self, endpoint: str, data: dict):
+        try:
+            response = _HTTP.put(API_BASE_URL + endpoint,
+                                 auth=(self.token, self.secret), json=data)
+        except requests.exceptions.ConnectionError:
+            raise Exception("Kunne ikke koble til Domeneshop API")
+        return self._handle(response)
+
+    def _delete(self, endpoint: str):
+        try:
+            response = _HTTP.delete(API_BASE_URL + endpoint,
+                                    auth=(self.token, self.secret))
+        except requests.exceptions.ConnectionError:
+            raise Exception("Kunne ikke koble til Domeneshop API")
+        return self._handle(response)
+
+    def _request_raw(self, method: str, endpoint: str, params=None):
+        """Hent rå svarkropp uten JSON-parse
+
+        For listeendepunktene videresendes kroppen uendret til
+        nettleseren, så parse + re-serialisering er bortkastet arbeid.
+        """
+        url = f"{API_BASE_URL}{endpoint}"
+        try:
+            response = _HTTP.request(
+                method=method,
+                url=url,
+                auth=(self.token, self.secret),
+                params=params
+            )
+            return response.content, response.status_code
+        except requests.exceptions.ConnectionError:
+            raise Exception("Kunne ikke koble til Domeneshop API")
+
     # Domener
     def get_domains(self, domain_filter=None):
         params = {"domain": domain_filter} if domain_filter else None
-        return self._request("GET", "/domains", params=params)
+        return self._get("/domains", params=params)
 
     def get_domain(self, domain_id: int):
-        return self._request("GET", f"/domains/{domain_id}")
+        return self._get(f"/domains/{domain_id}")
 
     # DNS
     def get_dns_records(self, domain_id: int, host=None, record_type=None):
@@ -225,57 +423,96 @@ class DomeneshopClient:
             params["host"] = host
         if record_type:
             params["type"] = record_type
-        return self._request("GET", f"/domains/{domain_id}/dns", params=params or None)
+        return self._get(f"/domains/{domain_id}/dns", params=params or None)
 
     def create_dns_record(self, domain_id: int, record: dict):
-        return self._request("POST", f"/domains/{domain_id}/dns", data=record)
+        return self._post(f"/domains/{domain_id}/dns", record)
 
     def update_dns_record(self, domain_id: int, record_id: int, record: dict):
-        return self._request("PUT", f"/domains/{domain_id}/dns/{record_id}", data=record)
+        return self._put(f"/domains/{domain_id}/dns/{record_id}", record)
 
     def delete_dns_record(self, domain_id: int, record_id: int):
-        return self._request("DELETE", f"/domains/{domain_id}/dns/{record_id}")
+        return self._delete(f"/domains/{domain_id}/dns/{record_id}")
 
     def get_dns_record(self, domain_id: int, record_id: int):
-        return self._request("GET", f"/domains/{domain_id}/dns/{record_id}")
+        return self._get(f"/domains/{domain_id}/dns/{record_id}")
 
     # Forwards
     def get_forwards(self, domain_id: int):
-        return self._request("GET", f"/domains/{domain_id}/forwards/")
+        return self._get(f"/domains/{domain_id}/forwards/")
 
     def create_forward(self, domain_id: int, forward: dict):
-        return self._request("POST", f"/domains/{domain_id}/forwards/", data=forward)
+        return self._post(f"/domains/{domain_id}/forwards/", forward)
 
     def update_forward(self, domain_id: int, host: str, forward: dict):
-        return self._request("PUT", f"/domains/{domain_id}/forwards/{host}", data=forward)
+        return self._put(f"/domains/{domain_id}/forwards/{host}", forward)
 
     def delete_forward(self, domain_id: int, host: str):
-        return self._request("DELETE", f"/domains/{domain_id}/forwards/{host}")
+        return self._delete(f"/domains/{domain_id}/forwards/{host}")
 
     def get_forward(self, domain_id: int, host: str):
-        return self._request("GET", f"/domains/{domain_id}/forwards/{host}")
+        return self._get(f"/domains/{domain_id}/forwards/{host}")
 
     # Invoices
     def get_invoices(self, status=None):
         params = {"status": status} if status else None
-        return self._request("GET", "/invoices", params=params)
+        return self._get("/invoices", params=params)
 
     def get_invoice(self, invoice_id: int):
-        return self._request("GET", f"/invoices/{invoice_id}")
+        return self._get(f"/invoices/{invoice_id}")
 
     # DDNS
     def update_ddns(self, hostname: str, myip=None):
         params = {"hostname": hostname}
         if myip:
             params["myip"] = myip
-        return self._request("GET", "/dyndns/update", params=params)
+        return self._get("/dyndns/update", params=params)
+
+
+# Kontolisten gjenbrukes på tvers av forespørsler - flere endepunkter
+# kaller list_accounts() per kall, og hvert kall treffer keychain/fil.
+# Tømmes ved alle kontomutasjoner.
+_accounts_cache: dict = {"v": None}
+
+
+def _accounts():
+    """Hent kontolisten, cachet til første mutasjon"""
+    names = _accounts_cache["v"]
+    if names is None:
+        # Sortert for visning i kontolisten; medlemskapssjekkene bryr
+        # seg ikke om rekkefølgen
+        names = list_accounts(sort=True)
+        _accounts_cache["v"] = names
+    return names
+
+
+def _invalidate_accounts_cache():
+    _accounts_cache["v"] = None
+
+
+# Klient per konto gjenbrukes på tvers av forespørsler: get_client()
+# kalles fra hvert /api/*-endepunkt, og credential-lastingen bak den
+# (keychain-IPC eller fillesing) er det dyre leddet. Tømmes ved alle
+# credential-mutasjoner.
+_client_cache: dict = {}  # {kontonavn eller _LEGACY_CLIENT_KEY: DomeneshopClient}
+_LEGACY_CLIENT_KEY = "__legacy__"
+
+
+def _invalidate_client_cache():
+    """Tøm klient-cachen etter at credentials er endret"""
+    _client_cache.clear()
 
 
 def get_client(account_name: str = None):
     """Hent API-klient for en spesifikk konto eller valgt konto i session"""
     # Bruk konto fra parameter, session, eller default
     account = account_name or session.get('active_account')
-    
+    cache_key = account or _LEGACY_CLIENT_KEY
+
+    client = _client_cache.get(cache_key)
+    if client is not None:
+        return client
+
     if account:
         token, secret = load_account(account)
     else:
@@ -284,7 +521,57 @@ def get_client(account_name: str = None):
     
     if not token or not secret:
         return None
-    return DomeneshopClient(token, secret)
+    client = DomeneshopClient(token, secret)
+    _client_cache[cache_key] = client
+    return client
+
+
+@app.before_request
+def _parse_body():
+    """Parse forespørselskroppen én gang per forespørsel til g.body
+
+    Både CSRF-valideringen og endepunktene leser JSON-kroppen;
+    request.json ville gitt hver av dem sin egen vei inn til parseren.
+    orjson (C-utvidelse) brukes når den finnes.
+    """
+    raw = request.get_data()
+    if raw:
+        try:
+            parsed = orjson.loads(raw) if orjson else json.loads(raw)
+        except ValueError:
+            parsed = None
+        # API-et tar bare JSON-objekter; alt annet behandles som tom kropp
+        g.body = parsed if isinstance(parsed, dict) else {}
+    else:
+        g.body = {}
+
+
+# Endepunkter som trenger autentisert API-klient; resten (auth-,
+# konto- og CSRF-endepunktene) bygger egne klienter fra innsendte
+# credentials eller trenger ingen
+_CLIENT_ENDPOINTS = frozenset((
+    "api_domains", "api_domain",
+    "api_dns_list", "api_dns_create", "api_dns_update",
+    "api_dns_delete", "api_dns_get",
+    "api_forwards_list", "api_forwards_create", "api_forwards_delete",
+    "api_forwards_get", "api_forwards_update",
+    "api_invoices", "api_invoice_get",
+    "api_ddns",
+))
+
+
+@app.before_request
+def _attach_client():
+    """Slå opp API-klienten én gang per forespørsel og legg den på g
+
+    Handlerne leser g.client i stedet for å gjenta get_client()-
+    oppslaget og ikke-autentisert-sjekken hver for seg.
+    """
+    if request.endpoint in _CLIENT_ENDPOINTS:
+        client = get_client()
+        if client is None:
+            return j({"error": "Ikke autentisert"}), 401
+        g.client = client
 
 
 # ==================== CONTEXT PROCESSOR ====================
@@ -316,7 +603,7 @@ def index():
 def settings():
     """Innstillinger-side"""
     info = get_credentials_info()
-    accounts = list_accounts()
+    accounts = _accounts()
     active_account = session.get('active_account')
     
     # Auto-velg hvis bare én konto
@@ -339,7 +626,7 @@ def settings():
 @app.route("/api/csrf-token")
 def api_csrf_token():
     """Hent CSRF-token"""
-    return jsonify({"csrf_token": generate_csrf_token()})
+    return j({"csrf_token": generate_csrf_token()})
 
 
 @app.route("/api/auth/status")
@@ -347,15 +634,15 @@ def api_auth_status():
     """Sjekk autentiseringsstatus"""
     client = get_client()
     if not client:
-        return jsonify({"authenticated": False})
+        return j({"authenticated": False})
     try:
         client.get_domains()
-        return jsonify({
+        return j({
             "authenticated": True,
             "storage_info": get_credentials_info()
         })
     except Exception:
-        return jsonify({"authenticated": False})
+        return j({"authenticated": False})
 
 
 @app.route("/api/auth/save", methods=["POST"])
@@ -363,7 +650,7 @@ def api_auth_status():
 @csrf_protect
 def api_auth_save():
     """Lagre credentials"""
-    data = request.json or {}
+    data = g.body
     token = data.get("token", "").strip()
     secret = data.get("secret", "").strip()
     prefer_keychain = data.get("prefer_keychain", True)
@@ -373,15 +660,15 @@ def api_auth_save():
     # Valider input
     if not token or not secret:
         log_invalid_input("token/secret", "missing", ip)
-        return jsonify({"success": False, "error": "Token og secret er påkrevd"}), 400
+        return j({"success": False, "error": "Token og secret er påkrevd"}), 400
     
     if not validate_token_format(token):
         log_invalid_input("token", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig token-format"}), 400
+        return j({"success": False, "error": "Ugyldig token-format"}), 400
     
     if not validate_secret_format(secret):
         log_invalid_input("secret", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig secret-format"}), 400
+        return j({"success": False, "error": "Ugyldig secret-format"}), 400
     
     # Test credentials
     client = DomeneshopClient(token, secret)
@@ -392,19 +679,23 @@ def api_auth_save():
         success, storage_type = save_credentials(token, secret, prefer_keychain=prefer_keychain)
         
         if success:
+            _invalidate_client_cache()
+            # save_credentials oppretter "Standard"-kontoen, så
+            # kontolisten er også utdatert
+            _invalidate_accounts_cache()
             log_auth_success(ip, get_user_agent())
             log_credentials_saved(storage_type, ip)
-            return jsonify({
+            return j({
                 "success": True, 
                 "storage_type": storage_type,
                 "message": f"Credentials lagret i {storage_type}"
             })
         else:
-            return jsonify({"success": False, "error": "Kunne ikke lagre credentials"}), 500
+            return j({"success": False, "error": "Kunne ikke lagre credentials"}), 500
             
     except Exception as e:
         log_auth_failure(str(e), ip, get_user_agent())
-        return jsonify({"success": False, "error": str(e)}), 401
+        return j({"success": False, "error": str(e)}), 401
 
 
 @app.route("/api/auth/delete", methods=["POST"])
@@ -415,10 +706,12 @@ def api_auth_delete():
     ip = get_client_ip()
     
     if delete_credentials():
+        _invalidate_client_cache()
+        _invalidate_accounts_cache()
         log_credentials_deleted(ip)
-        return jsonify({"success": True})
+        return j({"success": True})
     else:
-        return jsonify({"success": False, "error": "Ingen credentials å slette"})
+        return j({"success": False, "error": "Ingen credentials å slette"})
 
 
 @app.route("/api/auth/migrate", methods=["POST"])
@@ -427,13 +720,14 @@ def api_auth_delete():
 def api_auth_migrate():
     """Migrer credentials til keychain"""
     if not KEYRING_AVAILABLE:
-        return jsonify({"success": False, "error": "Keyring ikke tilgjengelig"}), 400
+        return j({"success": False, "error": "Keyring ikke tilgjengelig"}), 400
     
     success, message = migrate_file_to_keychain()
     if success:
-        return jsonify({"success": True, "message": message})
+        _invalidate_client_cache()
+        return j({"success": True, "message": message})
     else:
-        return jsonify({"success": False, "error": message}), 400
+        return j({"success": False, "error": message}), 400
 
 
 # ==================== ACCOUNT ENDPOINTS ====================
@@ -441,14 +735,14 @@ def api_auth_migrate():
 @app.route("/api/accounts")
 def api_accounts_list():
     """List alle kontoer"""
-    accounts = list_accounts()
+    accounts = _accounts()
     active = session.get('active_account')
     
     # Hvis ingen aktiv konto er valgt, bruk første/eneste
     if not active and len(accounts) == 1:
         active = accounts[0]
     
-    return jsonify({
+    return j({
         "accounts": accounts,
         "active_account": active,
         "count": len(accounts)
@@ -459,33 +753,33 @@ def api_accounts_list():
 @csrf_protect
 def api_accounts_select():
     """Velg aktiv konto for session"""
-    data = request.json or {}
+    data = g.body
     account_name = data.get("name") or data.get("account")
     
     if not account_name:
-        return jsonify({"success": False, "error": "Kontonavn påkrevd"}), 400
+        return j({"success": False, "error": "Kontonavn påkrevd"}), 400
     
     # Verifiser at kontoen finnes
-    accounts = list_accounts()
+    accounts = _accounts()
     if account_name not in accounts:
-        return jsonify({"success": False, "error": f"Konto '{account_name}' finnes ikke"}), 404
+        return j({"success": False, "error": f"Konto '{account_name}' finnes ikke"}), 404
     
     # Verifiser at credentials fungerer
     token, secret = load_account(account_name)
     if not token or not secret:
-        return jsonify({"success": False, "error": "Kunne ikke laste credentials"}), 500
+        return j({"success": False, "error": "Kunne ikke laste credentials"}), 500
     
     try:
         client = DomeneshopClient(token, secret)
         client.get_domains()
     except Exception as e:
-        return jsonify({"success": False, "error": f"Autentisering feilet: {e}"}), 401
+        return j({"success": False, "error": f"Autentisering feilet: {e}"}), 401
     
     # Lagre i session
     session['active_account'] = account_name
     log_account_selected(account_name, get_client_ip())
     
-    return jsonify({
+    return j({
         "success": True,
         "active_account": account_name
     })
@@ -496,7 +790,7 @@ def api_accounts_select():
 @csrf_protect
 def api_accounts_create():
     """Opprett ny konto"""
-    data = request.json or {}
+    data = g.body
     name = data.get("name", "").strip()
     token = data.get("token", "").strip()
     secret = data.get("secret", "").strip()
@@ -507,23 +801,29 @@ def api_accounts_create():
     # Valider input
     if not name:
         log_invalid_input("name", "missing", ip)
-        return jsonify({"success": False, "error": "Kontonavn er påkrevd"}), 400
-    
+        return j({"success": False, "error": "Kontonavn er påkrevd"}), 400
+
+    # Samme whitelist som sti-parametrene: en konto som ikke kan nås via
+    # /api/accounts/<name> etterpå skal heller ikke kunne opprettes
+    if not _valid_account_name(name):
+        log_invalid_input("name", "invalid format", ip)
+        return j({"success": False, "error": "Ugyldig kontonavn (tillatt: bokstaver, tall, mellomrom, . _ -)"}), 400
+
     if not token or not secret:
         log_invalid_input("token/secret", "missing", ip)
-        return jsonify({"success": False, "error": "Token og secret er påkrevd"}), 400
+        return j({"success": False, "error": "Token og secret er påkrevd"}), 400
     
     if not validate_token_format(token):
         log_invalid_input("token", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig token-format"}), 400
+        return j({"success": False, "error": "Ugyldig token-format"}), 400
     
     if not validate_secret_format(secret):
         log_invalid_input("secret", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig secret-format"}), 400
+        return j({"success": False, "error": "Ugyldig secret-format"}), 400
     
     # Sjekk at navn ikke er i bruk
-    if name in list_accounts():
-        return jsonify({"success": False, "error": f"Konto '{name}' finnes allerede"}), 409
+    if name in _accounts():
+        return j({"success": False, "error": f"Konto '{name}' finnes allerede"}), 409
     
     # Test credentials
     try:
@@ -532,26 +832,28 @@ def api_accounts_create():
         domain_count = len(domains) if domains else 0
     except Exception as e:
         log_auth_failure(str(e), ip, get_user_agent())
-        return jsonify({"success": False, "error": f"Autentisering feilet: {e}"}), 401
+        return j({"success": False, "error": f"Autentisering feilet: {e}"}), 401
     
     # Lagre konto
     success, storage_type = save_account(name, token, secret, prefer_keychain)
     
     if success:
+        _invalidate_client_cache()
+        _invalidate_accounts_cache()
         log_auth_success(ip, get_user_agent())
         log_account_created(name, storage_type, ip)
         
         # Sett som aktiv konto
         session['active_account'] = name
         
-        return jsonify({
+        return j({
             "success": True,
             "storage_type": storage_type,
             "domain_count": domain_count,
             "message": f"Konto '{name}' opprettet ({storage_type})"
         })
     else:
-        return jsonify({"success": False, "error": f"Kunne ikke lagre konto: {storage_type}"}), 500
+        return j({"success": False, "error": f"Kunne ikke lagre konto: {storage_type}"}), 500
 
 
 @app.route("/api/accounts/<name>", methods=["DELETE"])
@@ -559,45 +861,58 @@ def api_accounts_create():
 @csrf_protect
 def api_accounts_delete(name):
     """Slett en konto"""
+    if not _valid_account_name(name):
+        return j({"success": False, "error": "Ugyldig kontonavn"}), 400
+
     ip = get_client_ip()
     
-    if name not in list_accounts():
-        return jsonify({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
+    if name not in _accounts():
+        return j({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
     
     if delete_account(name):
+        _invalidate_client_cache()
+        _invalidate_accounts_cache()
         log_account_deleted(name, ip)
         
         # Fjern fra session hvis det var aktiv konto
         if session.get('active_account') == name:
             session.pop('active_account', None)
         
-        return jsonify({"success": True})
+        return j({"success": True})
     else:
-        return jsonify({"success": False, "error": "Kunne ikke slette konto"}), 500
+        return j({"success": False, "error": "Kunne ikke slette konto"}), 500
 
 
 @app.route("/api/accounts/<old_name>/rename", methods=["POST"])
 @csrf_protect
 def api_accounts_rename(old_name):
     """Endre navn på en konto"""
-    data = request.json or {}
+    if not _valid_account_name(old_name):
+        return j({"success": False, "error": "Ugyldig kontonavn"}), 400
+
+    data = g.body
     new_name = data.get("new_name", "").strip()
     
     if not new_name:
-        return jsonify({"success": False, "error": "Nytt navn er påkrevd"}), 400
+        return j({"success": False, "error": "Nytt navn er påkrevd"}), 400
+
+    if not _valid_account_name(new_name):
+        return j({"success": False, "error": "Ugyldig kontonavn"}), 400
     
     success, message = rename_account(old_name, new_name)
     
     if success:
+        _invalidate_client_cache()
+        _invalidate_accounts_cache()
         log_account_renamed(old_name, new_name, get_client_ip())
         
         # Oppdater session hvis det var aktiv konto
         if session.get('active_account') == old_name:
             session['active_account'] = new_name
         
-        return jsonify({"success": True, "message": message})
+        return j({"success": True, "message": message})
     else:
-        return jsonify({"success": False, "error": message}), 400
+        return j({"success": False, "error": message}), 400
 
 
 @app.route("/api/accounts/<name>/update", methods=["POST"])
@@ -605,27 +920,30 @@ def api_accounts_rename(old_name):
 @csrf_protect
 def api_accounts_update(name):
     """Oppdater credentials for en konto"""
-    data = request.json or {}
+    if not _valid_account_name(name):
+        return j({"success": False, "error": "Ugyldig kontonavn"}), 400
+
+    data = g.body
     token = data.get("token", "").strip()
     secret = data.get("secret", "").strip()
     prefer_keychain = data.get("prefer_keychain", True)
     
     ip = get_client_ip()
     
-    if name not in list_accounts():
-        return jsonify({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
+    if name not in _accounts():
+        return j({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
     
     if not token or not secret:
         log_invalid_input("token/secret", "missing", ip)
-        return jsonify({"success": False, "error": "Token og secret er påkrevd"}), 400
+        return j({"success": False, "error": "Token og secret er påkrevd"}), 400
     
     if not validate_token_format(token):
         log_invalid_input("token", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig token-format"}), 400
+        return j({"success": False, "error": "Ugyldig token-format"}), 400
     
     if not validate_secret_format(secret):
         log_invalid_input("secret", "invalid format", ip)
-        return jsonify({"success": False, "error": "Ugyldig secret-format"}), 400
+        return j({"success": False, "error": "Ugyldig secret-format"}), 400
     
     # Test new credentials
     try:
@@ -634,261 +952,247 @@ def api_accounts_update(name):
         domain_count = len(domains) if domains else 0
     except Exception as e:
         log_auth_failure(str(e), ip, get_user_agent())
-        return jsonify({"success": False, "error": f"Autentisering feilet: {e}"}), 401
+        return j({"success": False, "error": f"Autentisering feilet: {e}"}), 401
     
     # Oppdater konto (slett og lagre på nytt)
     delete_account(name)
     success, storage_type = save_account(name, token, secret, prefer_keychain)
-    
+    _invalidate_client_cache()
+    _invalidate_accounts_cache()
+
     if success:
         log_auth_success(ip, get_user_agent())
-        return jsonify({
+        return j({
             "success": True,
             "storage_type": storage_type,
             "domain_count": domain_count,
             "message": f"Credentials oppdatert for '{name}'"
         })
     else:
-        return jsonify({"success": False, "error": "Kunne ikke oppdatere credentials"}), 500
+        return j({"success": False, "error": "Kunne ikke oppdatere credentials"}), 500
 
 
 @app.route("/api/accounts/<name>/test")
 def api_accounts_test(name):
     """Test tilkobling for en konto"""
-    if name not in list_accounts():
-        return jsonify({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
+    if not _valid_account_name(name):
+        return j({"success": False, "error": "Ugyldig kontonavn"}), 400
+
+    if name not in _accounts():
+        return j({"success": False, "error": f"Konto '{name}' finnes ikke"}), 404
     
     token, secret = load_account(name)
     if not token or not secret:
-        return jsonify({"success": False, "error": "Kunne ikke laste credentials"}), 500
+        return j({"success": False, "error": "Kunne ikke laste credentials"}), 500
     
     try:
         client = DomeneshopClient(token, secret)
         domains = client.get_domains()
         domain_count = len(domains) if domains else 0
-        return jsonify({
+        return j({
             "success": True,
             "domain_count": domain_count,
             "message": f"OK - {domain_count} domener"
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return j({"success": False, "error": str(e)}), 500
 
 
 @app.route("/api/domains")
 def api_domains():
     """Hent alle domener"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        domains = client.get_domains()
-        return jsonify(domains)
+        # Rå videresending: ingen parse/re-serialisering av listesvaret
+        body, status = client._request_raw("GET", "/domains")
+        return app.response_class(body, status=status, mimetype="application/json")
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>")
 def api_domain(domain_id):
     """Hent et domene"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
         domain = client.get_domain(domain_id)
-        return jsonify(domain)
+        return j(domain)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/dns")
 def api_dns_list(domain_id):
     """Hent DNS-poster"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        records = client.get_dns_records(domain_id)
-        return jsonify(records)
+        body, status = client._request_raw("GET", f"/domains/{domain_id}/dns")
+        return app.response_class(body, status=status, mimetype="application/json")
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/dns", methods=["POST"])
 @csrf_protect
 def api_dns_create(domain_id):
     """Opprett DNS-post"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        data = request.json
+        data = g.body
         result = client.create_dns_record(domain_id, data)
         log_dns_change("create", domain_id, result.get("id"), data.get("type"), get_client_ip())
-        return jsonify(result)
+        return j(result)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/dns/<int:record_id>", methods=["PUT"])
 @csrf_protect
 def api_dns_update(domain_id, record_id):
     """Oppdater DNS-post"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        data = request.json
+        data = g.body
         client.update_dns_record(domain_id, record_id, data)
         log_dns_change("update", domain_id, record_id, data.get("type"), get_client_ip())
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/dns/<int:record_id>", methods=["DELETE"])
 @csrf_protect
 def api_dns_delete(domain_id, record_id):
     """Slett DNS-post"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
         client.delete_dns_record(domain_id, record_id)
         log_dns_change("delete", domain_id, record_id, ip_address=get_client_ip())
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/dns/<int:record_id>")
 def api_dns_get(domain_id, record_id):
     """Hent spesifikk DNS-post"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
         record = client.get_dns_record(domain_id, record_id)
-        return jsonify(record)
+        return j(record)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/forwards")
 def api_forwards_list(domain_id):
     """Hent videresendinger"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        forwards = client.get_forwards(domain_id)
-        return jsonify(forwards)
+        body, status = client._request_raw("GET", f"/domains/{domain_id}/forwards/")
+        return app.response_class(body, status=status, mimetype="application/json")
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/forwards", methods=["POST"])
 @csrf_protect
 def api_forwards_create(domain_id):
     """Opprett videresending"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        data = request.json
+        data = g.body
         client.create_forward(domain_id, data)
         log_forward_change("create", domain_id, data.get("host", ""), get_client_ip())
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/forwards/<host>", methods=["DELETE"])
 @csrf_protect
 def api_forwards_delete(domain_id, host):
     """Slett videresending"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    if not _valid_host(host):
+        return j({"error": "Ugyldig host"}), 400
+
+    client = g.client
     try:
         client.delete_forward(domain_id, host)
         log_forward_change("delete", domain_id, host, get_client_ip())
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/forwards/<host>")
 def api_forwards_get(domain_id, host):
     """Hent spesifikk videresending"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    if not _valid_host(host):
+        return j({"error": "Ugyldig host"}), 400
+
+    client = g.client
     try:
         forward = client.get_forward(domain_id, host)
-        return jsonify(forward)
+        return j(forward)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/domains/<int:domain_id>/forwards/<host>", methods=["PUT"])
 @csrf_protect
 def api_forwards_update(domain_id, host):
     """Oppdater videresending"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    if not _valid_host(host):
+        return j({"error": "Ugyldig host"}), 400
+
+    client = g.client
     try:
-        data = request.json
+        data = g.body
         client.update_forward(domain_id, host, data)
         log_forward_change("update", domain_id, host, get_client_ip())
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/invoices")
 def api_invoices():
     """Hent fakturaer"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
         status = request.args.get("status")
-        invoices = client.get_invoices(status)
-        return jsonify(invoices)
+        params = {"status": status} if status else None
+        body, http_status = client._request_raw("GET", "/invoices", params=params)
+        return app.response_class(body, status=http_status, mimetype="application/json")
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/invoices/<int:invoice_id>")
 def api_invoice_get(invoice_id):
     """Hent spesifikk faktura"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
         invoice = client.get_invoice(invoice_id)
-        return jsonify(invoice)
+        return j(invoice)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 @app.route("/api/ddns", methods=["POST"])
 @csrf_protect
 def api_ddns():
     """Oppdater DDNS"""
-    client = get_client()
-    if not client:
-        return jsonify({"error": "Ikke autentisert"}), 401
+    client = g.client
     try:
-        data = request.json
+        data = g.body
         hostname = data.get("hostname")
         ip = data.get("ip")
         client.update_ddns(hostname, ip)
-        return jsonify({"success": True})
+        return j({"success": True})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return j({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
@@ -909,5 +1213,22 @@ if __name__ == "__main__":
     print("  - Sikre session-cookies")
     print("  - Audit logging")
     print("="*50 + "\n")
-    
-    app.run(debug=True, port=PORT, host="127.0.0.1")
+
+    if os.environ.get("FLASK_ENV") == "production":
+        # Flertrådet WSGI-server i stedet for werkzeugs enkelttrådede
+        # debug-server - forutsetning for at parallelle forespørsler
+        # (og rate-limiterens stripelåser) faktisk gir noe. ProxyFix
+        # lar klient-IP-en overleve en reverse proxy, så rate-limiteren
+        # ikke samler all trafikk i én bøtte.
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app)
+        try:
+            from waitress import serve
+        except ImportError:
+            print("  waitress er ikke installert (pip install waitress);")
+            print("  kjører werkzeug uten debug/reloader i stedet.\n")
+            app.run(debug=False, port=PORT, host="127.0.0.1")
+        else:
+            serve(app, host="127.0.0.1", port=PORT, threads=16)
+    else:
+        app.run(debug=True, port=PORT, host="127.0.0.1")
@@ -18,7 +18,6 @@ setup(
     install_requires=[
         "click>=8.1.0",
         "requests>=2.31.0",
-        "tabulate>=0.9.0",
     ],
     entry_points={
         "console_scripts": [